@@ -1,10 +1,25 @@
 # ai.py
 
+import logging
 import random
 import time
+from constants import *
+from instrumentation import counters, recorder
 from movement import Movement
 from wall_placement import WallPlacement
-from pathfinding import Pathfinding
+from pathfinding import Pathfinding, wall_edges
+from search import SearchEngine
+from openingbook import default_book
+from endgame import EndgameSolver
+from evaluation import Evaluator
+import batch_walls
+
+logger = logging.getLogger(__name__)
+
+def scan_order(wall):
+    """Sort key giving the row, column, horizontal-first order of a full board scan"""
+    row, col, horizontal = wall
+    return (row, col, not horizontal)
 
 class QuoridorAI:
     """
@@ -12,21 +27,55 @@ class QuoridorAI:
     
     - Easy: Makes random legal moves
     - Medium: Uses basic strategy - prioritizes moving toward goal and blocking opponent
-    - Hard: Uses minimax algorithm with alpha-beta pruning for optimal play
+    - Hard: Iterative-deepening negamax with alpha-beta pruning within a time budget
+    
+    Medium and hard play stored moves from the opening book when the position is in it,
+    and switch to the exact endgame solver once nobody has walls left.
+    
+    One instance can play every turn of a game: its movement, wall and path
+    caches and the hard AI's search engine are kept and only refreshed for
+    what changed on the board.
     """
     
-    def __init__(self, game_state, difficulty="medium"):
+    def __init__(self, game_state, difficulty="medium", time_limit=HARD_AI_TIME_LIMIT,
+                 transposition_table=None, stop_event=None, max_depth=HARD_AI_MAX_DEPTH,
+                 opening_book=None, use_book=True):
         self.game_state = game_state
         self.difficulty = difficulty
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.transposition_table = transposition_table
+        self.stop_event = stop_event
+        self.opening_book = opening_book
+        self.use_book = use_book
+        self.engine = None
         self.movement = Movement(game_state)
         self.wall_placement = WallPlacement(game_state)
         self.pathfinding = Pathfinding(game_state)
+        self.evaluator = Evaluator(game_state, self.pathfinding)
     
-    def get_move(self):
-        """Get AI move based on difficulty level"""
-        print(f"AI get_move called for player {self.game_state.current_player} with difficulty {self.difficulty}")
+    def get_move(self, record=True):
+        """Get AI move based on difficulty level; record=False keeps it out of the move statistics"""
+        logger.debug("AI get_move called for player %s with difficulty %s",
+                     self.game_state.current_player, self.difficulty)
+        if self.engine is not None:
+            self.engine.nodes = 0
+            self.engine.depth_reached = 0
+        token = recorder.begin(self) if record else None
         
-        if self.difficulty == "easy":
+        result = None
+        if self.difficulty in ("medium", "hard"):
+            if self.use_book:
+                result = self._book_move()
+            if result is None:
+                solver = EndgameSolver(self.game_state)
+                if solver.applies():
+                    result = solver.best_move()
+                    logger.debug("AI endgame move: %s", result)
+        
+        if result is not None:
+            pass
+        elif self.difficulty == "easy":
             result = self._easy_move()
         elif self.difficulty == "medium":
             result = self._medium_move()
@@ -35,46 +84,50 @@ class QuoridorAI:
         else:
             result = self._easy_move()  # Default to easy
 
-        print(f"AI {self.difficulty} selected move: {result}")
+        recorder.end(token, self, result)
+        logger.debug("AI %s selected move: %s", self.difficulty, result)
         return result
     
+    def _book_move(self):
+        """Opening-book move for this position, if there is a legal one"""
+        book = self.opening_book if self.opening_book is not None else default_book()
+        if book is None:
+            return None
+        entry = book.lookup(self.game_state.zobrist_key)
+        if entry is None:
+            return None
+        
+        move, games, wins = entry
+        player = self.game_state.current_player
+        if move[0] == "move":
+            legal = move[1] in self.movement.get_legal_moves(player)
+        else:
+            legal = (self.game_state.walls_remaining[player] > 0 and
+                     self.wall_placement.is_valid_wall_placement(*move[1])[0] and
+                     self.wall_placement.keeps_paths(*move[1], self.pathfinding))
+        if not legal:
+            return None
+        logger.debug("AI book move: %s (%s wins in %s games)", move, wins, games)
+        return move
+    
     def _easy_move(self):
         """Easy AI: Random moves with basic wall placement"""
         # 70% chance to move, 30% chance to place wall if available
         if (self.game_state.walls_remaining[self.game_state.current_player] > 0 and 
             random.random() < 0.3):
             # Try to place a random wall
-            wall_placements = []
-            for row in range(self.game_state.board_size - 1):
-                for col in range(self.game_state.board_size - 1):
-                    for horizontal in [True, False]:
-                        valid, _ = self.wall_placement.is_valid_wall_placement(row, col, horizontal)
-                        if valid:
-                            # Check if wall doesn't block paths - FIXED method name
-                            if horizontal:
-                                self.game_state.horizontal_walls[row][col] = True
-                            else:
-                                self.game_state.vertical_walls[row][col] = True
-                            
-                            if self.pathfinding.paths_exist_for_all_players():  # FIXED: was paths_exist_for_both_players
-                                wall_placements.append((row, col, horizontal))
-                            
-                            # Revert temporary wall
-                            if horizontal:
-                                self.game_state.horizontal_walls[row][col] = False
-                            else:
-                                self.game_state.vertical_walls[row][col] = False
+            wall_placements = sorted(self.wall_placement.legal_walls(self.pathfinding), key=scan_order)
             
             if wall_placements:
                 result = ("wall", random.choice(wall_placements))
-                print(f"AI easy selected wall: {result}")
+                logger.debug("AI easy selected wall: %s", result)
                 return result
         
         # Fall back to random move
         legal_moves = self.movement.get_legal_moves(self.game_state.current_player)
         if legal_moves:
             result = ("move", random.choice(legal_moves))
-            print(f"AI easy selected move: {result}")
+            logger.debug("AI easy selected move: %s", result)
             return result
         
         return None
@@ -85,15 +138,15 @@ class QuoridorAI:
         opponent = self._get_main_opponent(player)
         
         # Calculate current path lengths
-        player_path = self.pathfinding.shortest_path_length(player)
-        opponent_path = self.pathfinding.shortest_path_length(opponent)
+        player_path = self.evaluator.path_length(player)
+        opponent_path = self.evaluator.path_length(opponent)
         
         # If opponent is closer to goal, try to block them
         if opponent_path < player_path and self.game_state.walls_remaining[player] > 0:
             best_wall = self._find_best_blocking_wall(opponent)
             if best_wall:
                 result = ("wall", best_wall)
-                print(f"AI medium selected blocking wall: {result}")
+                logger.debug("AI medium selected blocking wall: %s", result)
                 return result
         
         # Otherwise, move toward goal
@@ -104,28 +157,21 @@ class QuoridorAI:
         # Find move that minimizes distance to goal
         best_move = None
         best_distance = float('inf')
+        distances = self.pathfinding.distance_map(player)
         
         for move in legal_moves:
-            # Temporarily make move
-            original_pos = self.game_state.player_positions[player]
-            self.game_state.player_positions[player] = list(move)
-            
-            # Calculate new distance
-            new_distance = self.pathfinding.shortest_path_length(player)
-            
-            # Restore position
-            self.game_state.player_positions[player] = original_pos
+            new_distance = distances[move[0]][move[1]]
             
             if new_distance < best_distance:
                 best_distance = new_distance
                 best_move = move
         
         result = ("move", best_move) if best_move else ("move", legal_moves[0])
-        print(f"AI medium selected move: {result}")
+        logger.debug("AI medium selected move: %s", result)
         return result
     
     def _hard_move(self):
-        """Hard AI: Uses minimax with alpha-beta pruning (simplified for performance)"""
+        """Hard AI: Iterative-deepening negamax with alpha-beta pruning"""
         player = self.game_state.current_player
         
         # First, check if we can win in one move
@@ -134,42 +180,43 @@ class QuoridorAI:
             row, col = move
             if self._is_winning_move(player, row, col):
                 result = ("move", move)
-                print(f"AI hard selected winning move: {result}")
+                logger.debug("AI hard selected winning move: %s", result)
                 return result
         
-        # Try to find a good wall placement
-        if self.game_state.walls_remaining[player] > 0:
-            opponent = self._get_main_opponent(player)
-            best_wall = self._find_best_blocking_wall(opponent)
-            if best_wall:
-                # Evaluate if this wall significantly helps
-                original_opponent_path = self.pathfinding.shortest_path_length(opponent)
-                
-                # Temporarily place wall
-                row, col, horizontal = best_wall
-                if horizontal:
-                    self.game_state.horizontal_walls[row][col] = True
-                else:
-                    self.game_state.vertical_walls[row][col] = True
-                
-                new_opponent_path = self.pathfinding.shortest_path_length(opponent)
-                
-                # Revert wall
-                if horizontal:
-                    self.game_state.horizontal_walls[row][col] = False
-                else:
-                    self.game_state.vertical_walls[row][col] = False
-                
-                if new_opponent_path > original_opponent_path + 1:  # Wall significantly blocks
-                    result = ("wall", best_wall)
-                    print(f"AI hard selected blocking wall: {result}")
-                    return result
+        engine = self._search_engine()
+        result = engine.search()
+        if result:
+            logger.debug("AI hard searched depth %s (%s nodes): %s", engine.depth_reached, engine.nodes, result)
+            return result
+        if self.stop_event is not None and self.stop_event.is_set():
+            return None
         
         # Use medium AI strategy as fallback
         result = self._medium_move()
-        print(f"AI hard fell back to medium: {result}")
+        logger.debug("AI hard fell back to medium: %s", result)
         return result
     
+    def _search_engine(self):
+        """The search engine kept between moves, set to this AI's current limits"""
+        engine = self.engine
+        if engine is None:
+            engine = SearchEngine(self.game_state, max_depth=self.max_depth, time_limit=self.time_limit,
+                                  transposition_table=self.transposition_table,
+                                  stop_event=self.stop_event)
+            self.engine = engine
+            self.transposition_table = engine.table
+        else:
+            engine.max_depth = self.max_depth
+            engine.time_limit = self.time_limit
+            engine.stop_event = self.stop_event
+        return engine
+    
+    def likely_replies(self, player, limit):
+        """The side to move's most promising actions against player, in search order"""
+        engine = self._search_engine()
+        engine.root_player = player
+        return engine.ordered_moves()[:limit]
+    
     def _get_main_opponent(self, player):
         """Get the main opponent (for 2-player games)"""
         if self.game_state.player_count == 2:
@@ -206,34 +253,45 @@ class QuoridorAI:
     def _find_best_blocking_wall(self, target_player):
         """Find wall that best blocks the target player"""
         best_wall = None
-        best_improvement = 0
-        
-        for row in range(self.game_state.board_size - 1):
-            for col in range(self.game_state.board_size - 1):
-                for horizontal in [True, False]:
-                    valid, _ = self.wall_placement.is_valid_wall_placement(row, col, horizontal)
-                    if valid:
-                        # Test this wall
-                        original_path = self.pathfinding.shortest_path_length(target_player)
-                        
-                        # Temporarily place wall
-                        if horizontal:
-                            self.game_state.horizontal_walls[row][col] = True
-                        else:
-                            self.game_state.vertical_walls[row][col] = True
-                        
-                        if self.pathfinding.paths_exist_for_all_players():  # FIXED: was paths_exist_for_both_players
-                            new_path = self.pathfinding.shortest_path_length(target_player)
-                            improvement = new_path - original_path
-                            
-                            if improvement > best_improvement:
-                                best_improvement = improvement
-                                best_wall = (row, col, horizontal)
-                        
-                        # Revert wall
-                        if horizontal:
-                            self.game_state.horizontal_walls[row][col] = False
-                        else:
-                            self.game_state.vertical_walls[row][col] = False
+        # A wall must add at least MEDIUM_MIN_WALL_GAIN steps to be worth placing
+        best_improvement = MEDIUM_MIN_WALL_GAIN - 1
+        
+        # Walls are scored by repairing one distance map instead of a fresh BFS each
+        distances = self.pathfinding.dynamic_distance_map(target_player)
+        target_row, target_col = self.game_state.player_positions[target_player]
+        original_path = distances.dist[target_row][target_col]
+        path_edges = distances.path_edges(target_row, target_col)
+        
+        # Walls off every shortest path cannot improve anything
+        candidates = [wall for wall in sorted(self.wall_placement.legal_walls(self.pathfinding), key=scan_order)
+                      if any(edge in path_edges for edge in wall_edges(*wall))]
+        
+        if batch_walls.available() and len(candidates) >= BATCH_WALLS_MIN:
+            # Score every candidate in one vectorized BFS
+            counters.walls_tried += len(candidates)
+            lengths = batch_walls.path_lengths(self.game_state, target_player, candidates,
+                                               self.pathfinding.get_goal_cells(target_player))
+            for wall, new_path in zip(candidates, lengths):
+                improvement = new_path - original_path
+                if improvement > best_improvement:
+                    best_improvement = improvement
+                    best_wall = wall
+            return best_wall
+        
+        for row, col, horizontal in candidates:
+            # Temporarily place wall
+            counters.walls_tried += 1
+            self.game_state.set_wall(row, col, horizontal, True)
+            changes = distances.update_wall(row, col, horizontal)
+            new_path = distances.dist[target_row][target_col]
+            improvement = new_path - original_path
+            
+            if improvement > best_improvement:
+                best_improvement = improvement
+                best_wall = (row, col, horizontal)
+            
+            # Revert wall
+            self.game_state.set_wall(row, col, horizontal, False)
+            distances.restore(changes)
         
         return best_wall
\ No newline at end of file
@@ -0,0 +1,204 @@
+# ai_worker.py
+
+import queue
+import threading
+import time
+import logging
+from constants import *
+from ai import QuoridorAI
+from transposition import TranspositionTable
+
+logger = logging.getLogger(__name__)
+
+class AIPlayer:
+    """
+    Long-lived AI for one seat of a game.
+
+    It owns a private copy of the game state and one QuoridorAI on that
+    copy, so distance maps, legal-wall sets and the search engine with its
+    transposition table survive from one turn to the next. sync() brings
+    the copy up to date by undoing and replaying only the actions that
+    differ from the real game's history; anything it cannot follow (a
+    loaded game, a new board) makes a fresh copy instead.
+
+    Between its turns a hard AI can ponder: search the likeliest replies of
+    the player before it and keep the answers, keyed by position, for an
+    instant reply if the real move is one of them.
+    """
+    def __init__(self, player, difficulty):
+        self.player = player
+        self.difficulty = difficulty
+        self.table = TranspositionTable()
+        self.game_state = None
+        self.ai = None
+        self.actions = []  # real-game history the private copy has played
+        self.first = 0     # ply of actions[0]; the real history may drop its oldest plies
+        self.base = 0      # ply the copy started from
+        self.worker = None
+        self.pondered = {}  # Zobrist key -> move found while pondering
+
+    def sync(self, game_state):
+        """Make the private copy match game_state; returns the number of actions replayed"""
+        first = game_state.history.dropped
+        actions = [delta[1] for delta in game_state.history]
+        private = self.game_state
+        if (private is not None and private.board_size == game_state.board_size
+                and first >= self.first):
+            # Plies the real history no longer holds are no longer compared
+            del self.actions[:first - self.first]
+            self.first = first
+            common = 0
+            for mine, theirs in zip(self.actions, actions):
+                if mine != theirs:
+                    break
+                common += 1
+            if (first + common >= self.base
+                    and len(self.actions) - common <= len(private.history)):
+                while len(self.actions) > common:
+                    private.revert_action(private.history.pop())
+                    self.actions.pop()
+                for action in actions[common:]:
+                    private.apply_action(action)
+                    self.actions.append(action)
+                if (private.zobrist_key == game_state.zobrist_key
+                        and private.game_over == game_state.game_over):
+                    return len(actions) - common
+            logger.debug("AI player %s lost track of the game, copying it again", self.player)
+
+        self.game_state = game_state.clone()
+        self.actions = actions
+        self.first = first
+        self.base = first + len(actions)
+        self.ai = QuoridorAI(self.game_state, self.difficulty, transposition_table=self.table)
+        return len(actions)
+
+    def stop(self):
+        """Cancel a running search and wait until it has left the private copy"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.thread.join()
+            self.worker = None
+
+
+class AIWorker:
+    """
+    Runs an AIPlayer's QuoridorAI.get_move on a background thread.
+
+    The AI searches its private copy of the game state, so the Tk thread can
+    keep drawing the real one. The chosen move is put on a queue that the
+    GUI polls with root.after. cancel() stops a search whose answer is no
+    longer wanted (undo, load, new game); its result is then never read.
+    """
+    def __init__(self, ai_player, game_state):
+        ai_player.stop()
+        ai_player.sync(game_state)
+        ai_player.worker = self
+        self.player = game_state.current_player
+        self.difficulty = ai_player.difficulty
+        self.position_key = game_state.zobrist_key
+        self.stop_event = threading.Event()
+        self.results = queue.Queue()
+        self.ai = ai_player.ai
+        self.ai.stop_event = self.stop_event
+        self.pondered = ai_player.pondered.get(self.position_key)
+        self.started = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def _run(self):
+        if self.pondered is not None:
+            logger.debug("AI player %s answers from pondering: %s", self.player, self.pondered)
+            self.results.put(("move", self.pondered))
+            return
+        try:
+            self.results.put(("move", self.ai.get_move()))
+        except Exception as e:
+            self.results.put(("error", e))
+
+    def cancel(self):
+        self.stop_event.set()
+
+    @property
+    def cancelled(self):
+        return self.stop_event.is_set()
+
+    def poll(self):
+        """("move", move) or ("error", exception) once finished, else None"""
+        try:
+            return self.results.get_nowait()
+        except queue.Empty:
+            return None
+
+    def progress(self):
+        """Short status text: time spent and, for the hard AI, depth completed"""
+        text = f"{time.perf_counter() - self.started:.1f}s"
+        engine = self.ai.engine
+        if engine is not None and engine.depth_reached:
+            text += f", depth {engine.depth_reached}"
+        return text
+
+
+class PonderWorker:
+    """
+    Searches an AIPlayer's answers to the likeliest moves of the player to
+    move, on a background thread while that player thinks.
+
+    Each reply is searched with the AI's full move time, so a pondered
+    answer is as strong as a normal move and can be played as is. Replies
+    are taken while PONDER_TIME_BUDGET still covers a full search. After
+    every reply the thread sleeps long enough to stay within
+    PONDER_CPU_SHARE of the wall time, so the UI stays responsive. cancel() (or the AIPlayer's next search)
+    stops it at once; an unfinished reply is not kept.
+    """
+    def __init__(self, ai_player, game_state):
+        ai_player.stop()
+        ai_player.sync(game_state)
+        ai_player.worker = self
+        ai_player.pondered = {}
+        self.ai_player = ai_player
+        self.position_key = game_state.zobrist_key
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        seat = self.ai_player
+        ai = seat.ai
+        gs = seat.game_state
+        ai.stop_event = self.stop_event
+        spent = 0.0
+        try:
+            for reply in ai.likely_replies(seat.player, PONDER_REPLIES):
+                if PONDER_TIME_BUDGET - spent < ai.time_limit or self.stop_event.is_set():
+                    break
+                delta = gs.apply_action(reply, record=False)
+                try:
+                    if gs.game_over or gs.current_player != seat.player:
+                        continue
+                    started = time.perf_counter()
+                    move = ai.get_move(record=False)
+                    elapsed = time.perf_counter() - started
+                    spent += elapsed
+                    if self.stop_event.is_set():
+                        break
+                    if move is not None:
+                        seat.pondered[gs.zobrist_key] = move
+                        logger.debug("AI player %s pondered %s -> %s in %.2fs",
+                                     seat.player, reply, move, elapsed)
+                finally:
+                    gs.revert_action(delta)
+                self.stop_event.wait(elapsed * (1 - PONDER_CPU_SHARE) / PONDER_CPU_SHARE)
+        except Exception as e:
+            logger.error("Error while pondering: %s", e)
+
+    def cancel(self):
+        self.stop_event.set()
+
+    @property
+    def cancelled(self):
+        return self.stop_event.is_set()
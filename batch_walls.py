@@ -0,0 +1,66 @@
+# batch_walls.py
+
+try:
+    import numpy as np
+except ImportError:  # optional: callers fall back to scoring walls one at a time
+    np = None
+
+def available():
+    return np is not None
+
+def path_lengths(game_state, player, walls, goal_cells):
+    """
+    Player's shortest path length with each wall of walls added, in one call.
+
+    Builds one copy of the board's passable edges per candidate wall, removes
+    that wall's two edges from its copy, then runs a BFS from the goal cells
+    over the whole stack at once, one array expansion per distance step.
+    Walls must be legal, so every copy still has a path.
+    """
+    size = game_state.board_size
+    count = len(walls)
+    H = np.array([list(row) for row in game_state.horizontal_walls], dtype=bool).reshape(size - 1, size - 1)
+    V = np.array([list(row) for row in game_state.vertical_walls], dtype=bool).reshape(size - 1, size - 1)
+
+    # down[r, c]: (r, c) <-> (r+1, c) is open; right[r, c]: (r, c) <-> (r, c+1) is open
+    down = np.ones((size - 1, size), dtype=bool)
+    down[:, :-1] &= ~H
+    down[:, 1:] &= ~H
+    right = np.ones((size, size - 1), dtype=bool)
+    right[:-1, :] &= ~V
+    right[1:, :] &= ~V
+
+    down = np.repeat(down[np.newaxis], count, axis=0)
+    right = np.repeat(right[np.newaxis], count, axis=0)
+    rows = np.array([w[0] for w in walls], dtype=np.intp)
+    cols = np.array([w[1] for w in walls], dtype=np.intp)
+    horizontal = np.array([w[2] for w in walls], dtype=bool)
+    index = np.arange(count)
+    h, v = index[horizontal], index[~horizontal]
+    down[h, rows[h], cols[h]] = False
+    down[h, rows[h], cols[h] + 1] = False
+    right[v, rows[v], cols[v]] = False
+    right[v, rows[v] + 1, cols[v]] = False
+
+    goal = np.zeros((size, size), dtype=bool)
+    for r, c in goal_cells:
+        goal[r, c] = True
+    frontier = np.repeat(goal[np.newaxis], count, axis=0)
+    reached = frontier.copy()
+
+    pr, pc = game_state.player_positions[player]
+    result = np.full(count, -1)
+    result[frontier[:, pr, pc]] = 0
+    distance = 0
+    while (result < 0).any() and frontier.any():
+        distance += 1
+        step = np.zeros_like(frontier)
+        step[:, 1:, :] |= frontier[:, :-1, :] & down
+        step[:, :-1, :] |= frontier[:, 1:, :] & down
+        step[:, :, 1:] |= frontier[:, :, :-1] & right
+        step[:, :, :-1] |= frontier[:, :, 1:] & right
+        step &= ~reached
+        reached |= step
+        frontier = step
+        result[(result < 0) & step[:, pr, pc]] = distance
+    return result.tolist()
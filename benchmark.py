@@ -0,0 +1,170 @@
+# benchmark.py
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from constants import *
+from game_state import GameState
+from movement import Movement
+from wall_placement import WallPlacement
+from pathfinding import Pathfinding
+from ai import QuoridorAI
+from transposition import TranspositionTable
+
+def random_position(seed, board_size, player_count, engine="lists"):
+    """Reproducible mid-game position: pawns advanced and about half the walls placed"""
+    rnd = random.Random(seed)
+    gs = GameState(board_size, player_count, {1: None, 2: None, 3: None, 4: None}, engine=engine)
+    movement = Movement(gs)
+    wall_placement = WallPlacement(gs)
+    pathfinding = Pathfinding(gs)
+
+    for _ in range(board_size * player_count):
+        player = gs.current_player
+        placed = False
+        if gs.walls_remaining[player] > 1 and rnd.random() < 0.5:
+            walls = sorted(wall_placement.legal_walls(pathfinding))
+            if walls:
+                gs.apply_action(("wall", rnd.choice(walls)))
+                placed = True
+        if not placed:
+            distances = pathfinding.distance_map(player)
+            moves = sorted(movement.get_legal_moves(player), key=lambda m: (distances[m[0]][m[1]], m))
+            # Mostly head for the goal, sometimes wander
+            move = moves[0] if rnd.random() < 0.7 else rnd.choice(moves)
+            delta = gs.apply_action(("move", tuple(move)))
+            if gs.game_over:
+                gs.revert_action(delta)
+                break
+
+    gs.clear_history()
+    return gs
+
+def _opponent(gs):
+    player = gs.current_player
+    return min((p for p in gs.player_positions if p != player),
+               key=Pathfinding(gs).shortest_path_length)
+
+def _all_slots(gs):
+    size = gs.board_size - 1
+    return [(r, c, h) for r in range(size) for c in range(size) for h in (True, False)]
+
+# name -> function(game_state) running one call of the measured code. Cached
+# helpers (Pathfinding, QuoridorAI) are built fresh so every call does full work.
+BENCHMARKS = {
+    "get_legal_moves": lambda gs: Movement(gs).get_legal_moves(gs.current_player),
+    "shortest_path_length": lambda gs: Pathfinding(gs).shortest_path_length(gs.current_player),
+    "paths_exist_for_all_players": lambda gs: Pathfinding(gs).paths_exist_for_all_players(),
+    "is_valid_wall_placement (all slots)": lambda gs: [
+        WallPlacement(gs).is_valid_wall_placement(r, c, h) for r, c, h in _all_slots(gs)],
+    "find_best_blocking_wall": lambda gs: QuoridorAI(gs, "medium")._find_best_blocking_wall(_opponent(gs)),
+    "ai_easy": lambda gs: QuoridorAI(gs, "easy").get_move(),
+    # Without the opening book, so timings measure search wherever they are run
+    "ai_medium": lambda gs: QuoridorAI(gs, "medium", use_book=False).get_move(),
+    "ai_hard": lambda gs: QuoridorAI(gs, "hard", time_limit=float("inf"), max_depth=BENCHMARK_HARD_DEPTH,
+                                     transposition_table=TranspositionTable(), use_book=False).get_move(),
+}
+
+def time_calls(function, game_state, repeat, min_time):
+    """Best-of-repeat seconds per call, each round looping for at least min_time"""
+    rounds = []
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            function(game_state)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        rounds.append(elapsed / calls)
+    return min(rounds)
+
+def run(args):
+    results = []
+    names = [n for n in BENCHMARKS if not args.only or any(o in n for o in args.only)]
+    for board_size in args.board_sizes:
+        for player_count in args.players:
+            positions = [random_position(args.seed * 1000 + i, board_size, player_count, args.engine)
+                         for i in range(args.positions)]
+            for name in names:
+                per_position = []
+                for gs in positions:
+                    # Seeded so easy/medium choices, and so their cost, are repeatable
+                    random.seed(args.seed)
+                    key = gs.zobrist_key
+                    per_position.append(time_calls(BENCHMARKS[name], gs, args.repeat, args.min_time))
+                    assert gs.zobrist_key == key, f"{name} changed the position"
+                result = {
+                    "name": name,
+                    "board_size": board_size,
+                    "players": player_count,
+                    "mean_us": 1e6 * statistics.mean(per_position),
+                    "median_us": 1e6 * statistics.median(per_position),
+                    "max_us": 1e6 * max(per_position),
+                }
+                results.append(result)
+                print(f"{name:<36} {board_size:>2}x{board_size:<2} {player_count}p "
+                      f"mean {result['mean_us']:>12.1f} us  max {result['max_us']:>12.1f} us")
+    return results
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_file):
+    """Print the mean-time ratio of every benchmark against an earlier run"""
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+    old = {(r["name"], r["board_size"], r["players"]): r["mean_us"] for r in baseline["results"]}
+    print(f"\nCompared with {baseline_file} (commit {baseline['commit']}), new/old mean time:")
+    for r in results:
+        key = (r["name"], r["board_size"], r["players"])
+        if key in old and old[key] > 0:
+            ratio = r["mean_us"] / old[key]
+            flag = "  <-- slower" if ratio > 1 + regression_threshold(r["name"]) else ""
+            print(f"{r['name']:<36} {r['board_size']:>2}x{r['board_size']:<2} {r['players']}p  {ratio:6.2f}x{flag}")
+
+def regression_threshold(name):
+    """Relative slowdown worth flagging; whole AI moves are noisier than primitives"""
+    return 0.25 if name.startswith("ai_") else 0.10
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time core Quoridor operations on seeded mid-game positions")
+    parser.add_argument("--board-sizes", type=int, nargs="+",
+                        default=list(range(MIN_BOARD_SIZE, MAX_BOARD_SIZE + 1)))
+    parser.add_argument("--players", type=int, nargs="+", choices=[2, 4], default=[2, 4])
+    parser.add_argument("--positions", type=int, default=3, help="positions per board size and player count")
+    parser.add_argument("--repeat", type=int, default=3, help="timing rounds per position (best is kept)")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per timing round")
+    parser.add_argument("--only", nargs="+", help="run benchmarks whose name contains any of these")
+    parser.add_argument("--engine", choices=BOARD_ENGINES, default="lists")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark.json", help="JSON file for the results")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "settings": vars(args),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {len(results)} results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
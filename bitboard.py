@@ -0,0 +1,225 @@
+# bitboard.py
+
+class WallRowView:
+    """One row of a packed wall grid, indexable like a list of bools"""
+    def __init__(self, board, horizontal, row):
+        self.board = board
+        self.horizontal = horizontal
+        self.row = row
+
+    def __len__(self):
+        return self.board.wall_size
+
+    def __getitem__(self, col):
+        if col < 0:
+            col += self.board.wall_size
+        if not 0 <= col < self.board.wall_size:
+            raise IndexError("wall column out of range")
+        return self.board.has_wall(self.row, col, self.horizontal)
+
+    def __setitem__(self, col, value):
+        if col < 0:
+            col += self.board.wall_size
+        if not 0 <= col < self.board.wall_size:
+            raise IndexError("wall column out of range")
+        self.board.set_wall(self.row, col, self.horizontal, value)
+
+    def __iter__(self):
+        for col in range(self.board.wall_size):
+            yield self.board.has_wall(self.row, col, self.horizontal)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class WallGridView:
+    """Packed wall grid exposed with the same [row][col] API as the nested lists"""
+    def __init__(self, board, horizontal):
+        self.board = board
+        self.horizontal = horizontal
+
+    def __len__(self):
+        return self.board.wall_size
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.board.wall_size
+        if not 0 <= row < self.board.wall_size:
+            raise IndexError("wall row out of range")
+        return WallRowView(self.board, self.horizontal, row)
+
+    def __iter__(self):
+        for row in range(self.board.wall_size):
+            yield WallRowView(self.board, self.horizontal, row)
+
+    def __eq__(self, other):
+        return self.to_lists() == [list(row) for row in other]
+
+    def __repr__(self):
+        return repr(self.to_lists())
+
+    def __deepcopy__(self, memo):
+        # Snapshots (history, save files) always hold plain nested lists
+        return self.to_lists()
+
+    def to_lists(self):
+        return [list(row) for row in self]
+
+
+class BitBoard:
+    """
+    Wall grids and per-cell blocked-edge masks packed into Python ints.
+
+    Wall slot (r, c) is bit r * (N - 1) + c of h_bits / v_bits. Cell (r, c) is
+    bit r * N + c of the four can_* masks, which are set when a pawn on that
+    cell may step in that direction (inside the board and not blocked).
+    """
+    def __init__(self, board_size):
+        self.board_size = board_size
+        self.wall_size = board_size - 1
+        self.h_bits = 0
+        self.v_bits = 0
+
+        N = board_size
+        self.full_mask = (1 << (N * N)) - 1
+        self.row_masks = [((1 << N) - 1) << (r * N) for r in range(N)]
+        self.col_masks = [sum(1 << (r * N + c) for r in range(N)) for c in range(N)]
+
+        self.can_up = self.full_mask & ~self.row_masks[0]
+        self.can_down = self.full_mask & ~self.row_masks[N - 1]
+        self.can_left = self.full_mask & ~self.col_masks[0]
+        self.can_right = self.full_mask & ~self.col_masks[N - 1]
+
+        self.horizontal = WallGridView(self, True)
+        self.vertical = WallGridView(self, False)
+
+    def has_wall(self, r, c, horizontal=True):
+        bits = self.h_bits if horizontal else self.v_bits
+        return bool((bits >> (r * self.wall_size + c)) & 1)
+
+    def set_wall(self, r, c, horizontal=True, value=True):
+        """Set or clear a wall slot and refresh the edges it covers"""
+        bit = 1 << (r * self.wall_size + c)
+        if horizontal:
+            self.h_bits = self.h_bits | bit if value else self.h_bits & ~bit
+            self._refresh_vertical_edge(r, c)
+            self._refresh_vertical_edge(r, c + 1)
+        else:
+            self.v_bits = self.v_bits | bit if value else self.v_bits & ~bit
+            self._refresh_horizontal_edge(r, c)
+            self._refresh_horizontal_edge(r + 1, c)
+
+    def load_walls(self, horizontal_walls, vertical_walls):
+        """Replace the whole wall set from nested [row][col] grids"""
+        W = self.wall_size
+        self.h_bits = 0
+        self.v_bits = 0
+        for r in range(W):
+            for c in range(W):
+                if horizontal_walls[r][c]:
+                    self.h_bits |= 1 << (r * W + c)
+                if vertical_walls[r][c]:
+                    self.v_bits |= 1 << (r * W + c)
+
+        N = self.board_size
+        for r in range(N - 1):
+            for c in range(N):
+                self._refresh_vertical_edge(r, c)
+        for r in range(N):
+            for c in range(N - 1):
+                self._refresh_horizontal_edge(r, c)
+
+    def _refresh_vertical_edge(self, r, c):
+        """Recompute the edge between cell (r, c) and the cell below it"""
+        W = self.wall_size
+        blocked = False
+        if c < W and (self.h_bits >> (r * W + c)) & 1:
+            blocked = True
+        elif c > 0 and (self.h_bits >> (r * W + c - 1)) & 1:
+            blocked = True
+
+        N = self.board_size
+        upper = 1 << (r * N + c)
+        lower = upper << N
+        if blocked:
+            self.can_down &= ~upper
+            self.can_up &= ~lower
+        else:
+            self.can_down |= upper
+            self.can_up |= lower
+
+    def _refresh_horizontal_edge(self, r, c):
+        """Recompute the edge between cell (r, c) and the cell to its right"""
+        W = self.wall_size
+        blocked = False
+        if r < W and (self.v_bits >> (r * W + c)) & 1:
+            blocked = True
+        elif r > 0 and (self.v_bits >> ((r - 1) * W + c)) & 1:
+            blocked = True
+
+        left = 1 << (r * self.board_size + c)
+        right = left << 1
+        if blocked:
+            self.can_right &= ~left
+            self.can_left &= ~right
+        else:
+            self.can_right |= left
+            self.can_left |= right
+
+    def is_blocked_between(self, r1, c1, r2, c2):
+        """Same contract as Movement.is_blocked_between, answered with one bit test"""
+        dr = r2 - r1
+        dc = c2 - c1
+        bit = r1 * self.board_size + c1
+        if dr == -1 and dc == 0:
+            return not (self.can_up >> bit) & 1
+        if dr == 1 and dc == 0:
+            return not (self.can_down >> bit) & 1
+        if dc == -1 and dr == 0:
+            return not (self.can_left >> bit) & 1
+        if dc == 1 and dr == 0:
+            return not (self.can_right >> bit) & 1
+        return True
+
+    def cell_mask(self, r, c):
+        return 1 << (r * self.board_size + c)
+
+    def expand(self, frontier):
+        """All cells one unblocked step away from any cell in frontier"""
+        N = self.board_size
+        return (((frontier & self.can_up) >> N) |
+                ((frontier & self.can_down) << N) |
+                ((frontier & self.can_left) >> 1) |
+                ((frontier & self.can_right) << 1))
+
+    def distance(self, start_mask, goal_mask):
+        """Bit-parallel BFS: number of steps from start_mask to goal_mask"""
+        if start_mask & goal_mask:
+            return 0
+        visited = start_mask
+        frontier = start_mask
+        dist = 0
+        while frontier:
+            frontier = self.expand(frontier) & ~visited
+            dist += 1
+            if frontier & goal_mask:
+                return dist
+            visited |= frontier
+        return float('inf')
+
+    def layers(self, seed_mask):
+        """BFS layers outward from seed_mask, one cell mask per distance"""
+        layers = []
+        visited = seed_mask
+        frontier = seed_mask
+        while frontier:
+            layers.append(frontier)
+            frontier = self.expand(frontier) & ~visited
+            visited |= frontier
+        return layers
+
+    def reachable(self, start_mask, goal_mask):
+        return self.distance(start_mask, goal_mask) != float('inf')
@@ -0,0 +1,88 @@
+# connectivity.py
+
+class ConnectivityOracle:
+    """
+    Fast answer to "could this wall cut a player off from its goal?"
+
+    Walls and the board border are kept as a union-find over the
+    (N+1) x (N+1) lattice of cell corners. A wall covers three lattice
+    points, and it can only seal off a region if it closes a loop, i.e. two
+    of its points already belong to the same obstacle component. Walls that
+    close no loop never need a path search.
+    """
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.version = None
+        self.parent = []
+
+    def sync(self):
+        """Rebuild the union-find when the wall set changed (O(walls))"""
+        if self.version == self.game_state.wall_version:
+            return
+
+        size = len(self.game_state.horizontal_walls) + 1
+        points = size + 1
+        self.points = points
+        self.parent = list(range(points * points))
+
+        # The whole border is one obstacle
+        border = 0
+        for i in range(points):
+            for lr, lc in ((0, i), (size, i), (i, 0), (i, size)):
+                self._union(border, lr * points + lc)
+
+        H = self.game_state.horizontal_walls
+        V = self.game_state.vertical_walls
+        for r in range(size - 1):
+            for c in range(size - 1):
+                if H[r][c]:
+                    self._add(self.wall_points(r, c, True))
+                if V[r][c]:
+                    self._add(self.wall_points(r, c, False))
+        self.version = self.game_state.wall_version
+
+    def wall_points(self, r, c, horizontal=True):
+        """Lattice point ids covered by wall slot (r, c)"""
+        points = self.points
+        if horizontal:
+            base = (r + 1) * points + c
+            return (base, base + 1, base + 2)
+        base = r * points + c + 1
+        return (base, base + points, base + 2 * points)
+
+    def closes_loop(self, r, c, horizontal=True):
+        """True if the wall joins an obstacle component to itself"""
+        self.sync()
+        roots = [self._find(p) for p in self.wall_points(r, c, horizontal)]
+        return len(set(roots)) < 3
+
+    def keeps_paths(self, r, c, horizontal, pathfinding):
+        """Whether placing the wall leaves every player a path to its goal"""
+        if not self.closes_loop(r, c, horizontal):
+            return True
+
+        # Only loop-closing walls need the full search
+        self.game_state.set_wall(r, c, horizontal, True)
+        ok = pathfinding.paths_exist_for_all_players()
+        self.game_state.set_wall(r, c, horizontal, False)
+        # The wall set is back to what the union-find describes
+        self.version = self.game_state.wall_version
+        return ok
+
+    def _add(self, wall_points):
+        first = wall_points[0]
+        for p in wall_points[1:]:
+            self._union(first, p)
+
+    def _find(self, p):
+        parent = self.parent
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    def _union(self, a, b):
+        ra = self._find(a)
+        rb = self._find(b)
+        if ra != rb:
+            self.parent[rb] = ra
@@ -8,6 +8,78 @@ MIN_BOARD_SIZE = 5
 MAX_BOARD_SIZE = 12
 PADDING = 20
 
+# Board engines selectable when a GameState is built
+BOARD_ENGINES = ("lists", "bitboard")
+
+# Largest walls_remaining any setup hands out (see GameState.get_initial_walls)
+MAX_WALLS_PER_PLAYER = 12
+
+# Position hashing and AI search caches
+ZOBRIST_SEED = 20240601
+TRANSPOSITION_TABLE_SIZE = 1 << 16
+
+# Hard AI search settings
+HARD_AI_TIME_LIMIT = 2.0  # seconds per move
+HARD_AI_MAX_DEPTH = 6
+HARD_AI_WALL_CANDIDATES = 8  # walls tried per node, best detours first
+
+# With NumPy installed, the medium AI scores this many or more blocking-wall
+# candidates in one batched BFS (fewer are cheaper one at a time)
+BATCH_WALLS_MIN = 6
+
+# How often the GUI checks a background AI search (ms)
+AI_POLL_INTERVAL = 50
+
+# Headless self-play: games still running after this many moves are unfinished
+SELFPLAY_MAX_PLIES = 400
+
+# benchmark.py searches the hard AI to a fixed depth so timings are repeatable
+BENCHMARK_HARD_DEPTH = 2
+
+# Save files: the current binary format, and the pickle written by old versions
+SAVE_FILE = "quoridor_save.qrd"
+LEGACY_SAVE_FILE = "quoridor_save.pkl"
+SAVE_CHECKPOINT_INTERVAL = 32  # actions between full-position checkpoints
+
+# Games handed to each replay.py worker at a time
+REPLAY_CHUNK_SIZE = 64
+
+# Opening book built by openingbook.py from self-play records
+OPENING_BOOK_FILE = "opening_book.bin"
+OPENING_BOOK_PLIES = 12     # opening actions taken from each game
+OPENING_BOOK_MIN_GAMES = 3  # times a move must have been played to be booked
+
+# Solved no-walls-left race tables kept (one per wall layout)
+ENDGAME_CACHE_SIZE = 4
+
+# Position evaluation (evaluation.py): weight per feature, 0 switches it off
+EVALUATION_WEIGHTS = {
+    "path_difference": 10,   # nearest opponent's path minus our own
+    "walls_difference": 1,   # our walls left minus the best-supplied opponent's
+    "mobility": 0,           # our pawn moves minus the leading opponent's
+    "goal_distance": 0,      # leader's rows/columns to goal minus ours, ignoring walls
+    "threat_rank": 0,        # minus the number of opponents ahead of us
+}
+MEDIUM_MIN_WALL_GAIN = 1     # steps a medium AI's wall must add to the target's path
+
+# Undo history: packed deltas in a ring buffer, full positions every few plies
+HISTORY_CAPACITY = 4096         # plies kept for undo (and for redo)
+HISTORY_KEYFRAME_INTERVAL = 16  # plies between keyframes used to jump to a ply
+HISTORY_COMPRESS = False        # deflate keyframes, for very long sessions
+
+# Pacing of AI moves on screen; a delay of 0 plays as fast as the engine can
+AI_MOVE_DELAY = 500       # default ms between shown AI moves
+AI_MOVE_DELAY_MAX = 3000
+SPECTATOR_FPS = 30        # board redraws per second while AI moves are unpaced
+
+# Pondering: hard AI seats search the likeliest human replies during the human's turn
+PONDER_REPLIES = 4        # replies searched per human turn
+PONDER_TIME_BUDGET = 4 * HARD_AI_TIME_LIMIT  # seconds of search per human turn, a full move time per reply
+PONDER_CPU_SHARE = 0.5    # fraction of wall time pondering may use, leaving the rest to the UI
+
+# JSON-lines file written by the GUI's "Export Stats" button
+STATS_FILE = "quoridor_stats.jsonl"
+
 # Colors
 BOARD_COLOR = "#F9F9F9"
 LINE_COLOR = "#000000"
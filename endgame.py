@@ -0,0 +1,191 @@
+# endgame.py
+
+from collections import deque
+from constants import *
+from movement import Movement
+from pathfinding import Pathfinding
+
+WIN = 1
+LOSS = -1
+DRAW = 0
+
+# Solved tables by (board size, wall layout); walls cannot change once nobody has any left
+_tables = {}
+
+class EndgameSolver:
+    """
+    Perfect play once no player has walls left.
+
+    With two players the whole race, including jumps and diagonal jumps, is
+    solved by retrograde analysis over every (pawn 1, pawn 2, side to move)
+    state of the fixed wall layout. The table is built once per layout and
+    then answers any pawn positions instantly. With four players each pawn
+    simply takes a step that shortens its own path the most.
+    """
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.pathfinding = Pathfinding(game_state)
+
+    def applies(self):
+        return all(count == 0 for count in self.game_state.walls_remaining.values())
+
+    def best_move(self):
+        """("move", (r, c)) for the current player, or None without legal moves"""
+        gs = self.game_state
+        if gs.player_count != 2:
+            return self._greedy_move()
+
+        table = self.table()
+        size = gs.board_size
+        player = gs.current_player
+        other = 3 - player
+        me = _cell(gs.player_positions[player], size)
+        them = _cell(gs.player_positions[other], size)
+
+        best = None
+        best_rank = None
+        for cell in table.moves(me, them):
+            if cell in table.goals[player]:
+                return ("move", divmod(cell, size))
+            value, depth = table.lookup(other, cell if player == 1 else them, them if player == 1 else cell)
+            # Rank from our side: their loss (soonest first), a draw, their win (latest first)
+            if value == LOSS:
+                rank = (0, depth)
+            elif value == DRAW:
+                rank = (1, 0)
+            else:
+                rank = (2, -depth)
+            if best_rank is None or rank < best_rank:
+                best = cell
+                best_rank = rank
+        return ("move", divmod(best, size)) if best is not None else None
+
+    def outcome(self):
+        """(value, plies) for the side to move in a two-player position"""
+        gs = self.game_state
+        size = gs.board_size
+        return self.table().lookup(gs.current_player, _cell(gs.player_positions[1], size),
+                                   _cell(gs.player_positions[2], size))
+
+    def table(self):
+        gs = self.game_state
+        key = (gs.board_size, frozenset(gs.placed_walls))
+        table = _tables.get(key)
+        if table is None:
+            if len(_tables) >= ENDGAME_CACHE_SIZE:
+                _tables.pop(next(iter(_tables)))
+            table = RaceTable(gs, self.pathfinding)
+            _tables[key] = table
+        return table
+
+    def _greedy_move(self):
+        gs = self.game_state
+        player = gs.current_player
+        distances = self.pathfinding.distance_map(player)
+        moves = Movement(gs).get_legal_moves(player)
+        if not moves:
+            return None
+        return ("move", min(moves, key=lambda m: distances[m[0]][m[1]]))
+
+
+def _cell(position, size):
+    return position[0] * size + position[1]
+
+
+class RaceTable:
+    """Won/lost/drawn value and plies to the end for every two-player pawn race state"""
+    def __init__(self, game_state, pathfinding):
+        size = game_state.board_size
+        self.size = size
+        cells = size * size
+        self.cells = cells
+        adjacency = game_state.adjacency
+        self.neighbors = [[r * size + c for r, c in adjacency[cell // size][cell % size]]
+                          for cell in range(cells)]
+        self.goals = {p: {r * size + c for r, c in pathfinding.get_goal_cells(p)} for p in (1, 2)}
+        self._solve()
+
+    def _index(self, mover, a, b):
+        return ((a * self.cells) + b) * 2 + (mover - 1)
+
+    def lookup(self, mover, a, b):
+        """(value for mover, plies) with pawn 1 on cell a and pawn 2 on cell b"""
+        index = self._index(mover, a, b)
+        return self.value[index], self.depth[index]
+
+    def moves(self, me, them):
+        """Cells my pawn can reach in one move, with the jump rules of Movement.get_legal_moves"""
+        size = self.size
+        neighbors = self.neighbors
+        result = []
+        for cell in neighbors[me]:
+            if cell != them:
+                result.append(cell)
+                continue
+            # Jump straight over, or diagonally if the far side is walled off or off the board
+            straight = 2 * them - me
+            if straight in neighbors[them] and _in_line(me, them, straight, size):
+                result.append(straight)
+            else:
+                for diagonal in neighbors[them]:
+                    if diagonal != me and not _in_line(me, them, diagonal, size):
+                        result.append(diagonal)
+        return list(dict.fromkeys(result))
+
+    def _solve(self):
+        cells = self.cells
+        total = cells * cells * 2
+        self.value = [DRAW] * total
+        self.depth = [0] * total
+        remaining = [0] * total
+        predecessors = [[] for _ in range(total)]
+        queue = deque()
+
+        goals = self.goals
+        for a in range(cells):
+            if a in goals[1]:
+                continue
+            for b in range(cells):
+                if b == a or b in goals[2]:
+                    continue
+                for mover in (1, 2):
+                    index = self._index(mover, a, b)
+                    me, them = (a, b) if mover == 1 else (b, a)
+                    moves = self.moves(me, them)
+                    if any(cell in goals[mover] for cell in moves):
+                        self.value[index] = WIN
+                        self.depth[index] = 1
+                        queue.append(index)
+                        continue
+                    remaining[index] = len(moves)
+                    for cell in moves:
+                        after = self._index(3 - mover, cell, b) if mover == 1 else self._index(3 - mover, a, cell)
+                        predecessors[after].append(index)
+
+        # Work back from decided states: a move into a lost state wins, and a
+        # state whose moves all lead into won states is lost
+        value = self.value
+        depth = self.depth
+        while queue:
+            index = queue.popleft()
+            for before in predecessors[index]:
+                if value[before] != DRAW:
+                    continue
+                if value[index] == LOSS:
+                    value[before] = WIN
+                    depth[before] = depth[index] + 1
+                    queue.append(before)
+                else:
+                    remaining[before] -= 1
+                    if remaining[before] == 0:
+                        value[before] = LOSS
+                        depth[before] = depth[index] + 1
+                        queue.append(before)
+
+
+def _in_line(a, b, c, size):
+    """Whether cells a, b, c lie on one row or one column"""
+    ra, ca = divmod(a, size)
+    rb, cb = divmod(b, size)
+    rc, cc = divmod(c, size)
+    return (ra == rb == rc) or (ca == cb == cc)
@@ -0,0 +1,104 @@
+# evaluation.py
+
+from constants import *
+from movement import Movement
+from pathfinding import Pathfinding
+
+# Feature name -> function(evaluator, player) giving a value from player's
+# side, larger is better. Register more with @feature("name") and give
+# them a weight in EVALUATION_WEIGHTS or an Evaluator's weights.
+FEATURES = {}
+
+def feature(name):
+    def register(function):
+        FEATURES[name] = function
+        return function
+    return register
+
+
+class Evaluator:
+    """
+    Scores positions as a weighted sum of named features.
+
+    Path features read the Pathfinding distance maps, which are cached
+    until the walls change, so a search that only moves pawns between
+    leaves does no BFS at all. Pass the engine's own Pathfinding to share
+    its maps. Features with a zero weight are not computed.
+    """
+    def __init__(self, game_state, pathfinding=None, weights=None):
+        self.game_state = game_state
+        self.pathfinding = pathfinding if pathfinding is not None else Pathfinding(game_state)
+        self.weights = dict(EVALUATION_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        self._movement = None
+
+    @property
+    def movement(self):
+        if self._movement is None:
+            self._movement = Movement(self.game_state)
+        return self._movement
+
+    def score(self, player):
+        """Weighted feature total from player's point of view"""
+        total = 0
+        for name, weight in self.weights.items():
+            if weight:
+                total += weight * FEATURES[name](self, player)
+        return total
+
+    def features(self, player):
+        """Every registered feature's unweighted value, for tuning and debugging"""
+        return {name: function(self, player) for name, function in FEATURES.items()}
+
+    def path_length(self, player):
+        row, col = self.game_state.player_positions[player]
+        return self.pathfinding.distance_map(player)[row][col]
+
+    def opponents(self, player):
+        return [p for p in self.game_state.player_positions if p != player]
+
+    def leader(self, player):
+        """The opponent closest to winning"""
+        return min(self.opponents(player), key=self.path_length)
+
+
+@feature("path_difference")
+def path_difference(evaluator, player):
+    """Steps the nearest opponent still needs beyond our own"""
+    return evaluator.path_length(evaluator.leader(player)) - evaluator.path_length(player)
+
+@feature("walls_difference")
+def walls_difference(evaluator, player):
+    """Our walls left against the best-supplied opponent's"""
+    walls = evaluator.game_state.walls_remaining
+    return walls[player] - max(walls[p] for p in evaluator.opponents(player))
+
+@feature("mobility")
+def mobility(evaluator, player):
+    """Our legal pawn moves against the leading opponent's"""
+    moves = evaluator.movement.get_legal_moves
+    return len(moves(player)) - len(moves(evaluator.leader(player)))
+
+@feature("goal_distance")
+def goal_distance(evaluator, player):
+    """Rows or columns to the goal line ignoring walls, against the leading opponent's"""
+    return _line_distance(evaluator.game_state, evaluator.leader(player)) - _line_distance(evaluator.game_state, player)
+
+@feature("threat_rank")
+def threat_rank(evaluator, player):
+    """Minus the number of opponents closer to their goal than we are"""
+    own = evaluator.path_length(player)
+    return -sum(1 for p in evaluator.opponents(player) if evaluator.path_length(p) < own)
+
+
+def _line_distance(game_state, player):
+    row, col = game_state.player_positions[player]
+    last = game_state.board_size - 1
+    if player == 1:
+        return last - row
+    if player == 2:
+        return row
+    if player == 3:
+        return last - col
+    return col
@@ -1,30 +1,193 @@
 # game_state.py
 
 import copy
-import pickle
+import logging
 from constants import *
+from bitboard import BitBoard
+from movement import Movement
+from zobrist import zobrist_keys
+from history import DeltaLog, Keyframes
+import savefile
+
+logger = logging.getLogger(__name__)
 
 class GameState:
-    def __init__(self, board_size, player_count, ai_players):
+    def __init__(self, board_size, player_count, ai_players, engine="lists"):
+        if engine not in BOARD_ENGINES:
+            raise ValueError(f"Unknown board engine: {engine}")
         self.board_size = board_size
         self.player_count = player_count
         self.ai_players = ai_players
+        self.engine = engine
+        self.bitboard = None
+        self.wall_version = 0
         
         # Initialize game state variables
-        self.current_player = 1
+        self._current_player = 1
         self.mode = None
         self.legal_moves = []
-        self.history = []
-        self.redo_stack = []
+        self.history = DeltaLog()
+        self.redo_stack = DeltaLog()
+        self.keyframes = Keyframes()
         self.game_over = False
         
         # Initialize walls based on board size
-        self.horizontal_walls = [[False] * (board_size - 1) for _ in range(board_size - 1)]
-        self.vertical_walls = [[False] * (board_size - 1) for _ in range(board_size - 1)]
+        self.init_walls(board_size)
         
         # Set initial positions and walls
         self.set_initial_positions()
         self.walls_remaining = self.get_initial_walls(player_count, board_size)
+        self.zobrist_key = self.compute_zobrist_key()
+        self.keyframes.add(0, self)
+    
+    def init_walls(self, board_size):
+        """Create empty wall grids using the selected board engine"""
+        if self.engine == "bitboard":
+            self.bitboard = BitBoard(board_size)
+        else:
+            self._horizontal_walls = [[False] * (board_size - 1) for _ in range(board_size - 1)]
+            self._vertical_walls = [[False] * (board_size - 1) for _ in range(board_size - 1)]
+        self._adjacency = None
+        self._placed_walls = None
+        self.zobrist = zobrist_keys(board_size)
+        self.wall_version += 1
+    
+    def set_wall(self, r, c, horizontal=True, value=True):
+        """Set or clear one wall slot and update the four cells it touches"""
+        grid = self.horizontal_walls if horizontal else self.vertical_walls
+        if grid[r][c] != value:
+            self.zobrist_key ^= self.zobrist.wall_key(r, c, horizontal)
+        grid[r][c] = value
+        self.wall_version += 1
+        
+        if self._placed_walls is not None:
+            if value:
+                self._placed_walls.add((r, c, horizontal))
+            else:
+                self._placed_walls.discard((r, c, horizontal))
+        if self._adjacency is not None:
+            self._refresh_adjacency([(r, c), (r + 1, c), (r, c + 1), (r + 1, c + 1)])
+    
+    def restore_walls(self, horizontal_walls, vertical_walls):
+        """Bring the wall grids to the given layout, touching only slots that differ"""
+        if len(horizontal_walls) != len(self.horizontal_walls):
+            self.init_walls(len(horizontal_walls) + 1)
+        
+        H = self.horizontal_walls
+        V = self.vertical_walls
+        for r in range(len(horizontal_walls)):
+            for c in range(len(horizontal_walls)):
+                if H[r][c] != horizontal_walls[r][c]:
+                    self.set_wall(r, c, True, horizontal_walls[r][c])
+                if V[r][c] != vertical_walls[r][c]:
+                    self.set_wall(r, c, False, vertical_walls[r][c])
+    
+    @property
+    def current_player(self):
+        return self._current_player
+    
+    @current_player.setter
+    def current_player(self, player):
+        side = self.zobrist.side
+        self.zobrist_key ^= side[self._current_player] ^ side[player]
+        self._current_player = player
+    
+    def move_pawn(self, player, row, col):
+        """Put a player's pawn on (row, col), keeping the position key in step"""
+        old_row, old_col = self.player_positions[player]
+        self.zobrist_key ^= (self.zobrist.pawn_key(player, old_row, old_col) ^
+                             self.zobrist.pawn_key(player, row, col))
+        self.player_positions[player] = [row, col]
+    
+    def adjust_walls_remaining(self, player, delta):
+        """Add delta to a player's wall supply, keeping the position key in step"""
+        keys = self.zobrist.walls_left[player]
+        count = self.walls_remaining[player]
+        self.zobrist_key ^= keys[count] ^ keys[count + delta]
+        self.walls_remaining[player] = count + delta
+    
+    def compute_zobrist_key(self):
+        """Hash of pawns, walls, walls remaining and side to move, from scratch"""
+        keys = self.zobrist
+        key = keys.side[self._current_player]
+        for player, (row, col) in self.player_positions.items():
+            key ^= keys.pawn_key(player, row, col)
+        for player, count in self.walls_remaining.items():
+            key ^= keys.walls_left[player][count]
+        for r, c, horizontal in self.placed_walls:
+            key ^= keys.wall_key(r, c, horizontal)
+        return key
+    
+    @property
+    def placed_walls(self):
+        """Set of (r, c, horizontal) slots currently holding a wall"""
+        if self._placed_walls is None:
+            H = self.horizontal_walls
+            V = self.vertical_walls
+            self._placed_walls = set()
+            for r in range(len(H)):
+                for c in range(len(H)):
+                    if H[r][c]:
+                        self._placed_walls.add((r, c, True))
+                    if V[r][c]:
+                        self._placed_walls.add((r, c, False))
+        return self._placed_walls
+    
+    @property
+    def adjacency(self):
+        """Per-cell lists of neighbor cells not separated by a wall"""
+        if self._adjacency is None:
+            size = len(self.horizontal_walls) + 1
+            self._adjacency = [[[] for _ in range(size)] for _ in range(size)]
+            self._refresh_adjacency([(r, c) for r in range(size) for c in range(size)])
+        return self._adjacency
+    
+    def _refresh_adjacency(self, cells):
+        size = len(self._adjacency)
+        mover = Movement(self)
+        for r, c in cells:
+            neighbors = []
+            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < size and 0 <= nc < size and not mover.is_blocked_between(r, c, nr, nc):
+                    neighbors.append((nr, nc))
+            self._adjacency[r][c] = neighbors
+    
+    @property
+    def horizontal_walls(self):
+        if self.bitboard is not None:
+            return self.bitboard.horizontal
+        return self._horizontal_walls
+    
+    @horizontal_walls.setter
+    def horizontal_walls(self, walls):
+        if self.bitboard is not None:
+            if len(walls) != self.bitboard.wall_size:
+                self.bitboard = BitBoard(len(walls) + 1)
+            self.bitboard.load_walls(walls, self.bitboard.vertical.to_lists())
+        else:
+            self._horizontal_walls = walls
+        self._adjacency = None
+        self._placed_walls = None
+        self.wall_version += 1
+    
+    @property
+    def vertical_walls(self):
+        if self.bitboard is not None:
+            return self.bitboard.vertical
+        return self._vertical_walls
+    
+    @vertical_walls.setter
+    def vertical_walls(self, walls):
+        if self.bitboard is not None:
+            if len(walls) != self.bitboard.wall_size:
+                self.bitboard = BitBoard(len(walls) + 1)
+            self.bitboard.load_walls(self.bitboard.horizontal.to_lists(), walls)
+        else:
+            self._vertical_walls = walls
+        self._adjacency = None
+        self._placed_walls = None
+        self.wall_version += 1
     
     def set_initial_positions(self):
         """Set initial positions based on board size and player count"""
@@ -84,122 +247,208 @@ class GameState:
             walls[player] = base_walls
         return walls
     
-    def save_game_state(self):
-        state = {
-            "player_positions": copy.deepcopy(self.player_positions),
-            "horizontal_walls": copy.deepcopy(self.horizontal_walls),
-            "vertical_walls": copy.deepcopy(self.vertical_walls),
-            "current_player": self.current_player,
-            "walls_remaining": copy.deepcopy(self.walls_remaining),
-            "mode": self.mode,
-            "game_over": self.game_over,
-            "board_size": self.board_size,
-            "player_count": self.player_count
-        }
-        self.history.append(state)
-        # Clear redo stack when new action is taken
-        self.redo_stack.clear()
-        return state
+    def apply_action(self, action, record=True):
+        """
+        Apply ("move", (r, c)) or ("wall", (r, c, horizontal)) for the current
+        player, then pass the turn unless the action won the game. No legality
+        checks are made here. Returns the delta revert_action needs:
+        (player, action, pawn origin or None, game_over before the action).
+        """
+        player = self.current_player
+        kind, data = action
+        action = (kind, tuple(data))
+        origin = None
+        if kind == "move":
+            origin = tuple(self.player_positions[player])
+            self.move_pawn(player, data[0], data[1])
+        else:
+            self.set_wall(data[0], data[1], data[2], True)
+            self.adjust_walls_remaining(player, -1)
+        
+        delta = (player, action, origin, self.game_over)
+        if self.check_victory():
+            self.game_over = True
+        else:
+            self.current_player = self.get_next_player()
+        
+        if record:
+            if self.redo_stack:
+                # Keyframes of the abandoned line no longer apply
+                self.keyframes.discard_after(self.ply)
+            self.history.append(delta)
+            # Clear redo stack when new action is taken
+            self.redo_stack.clear()
+            self._add_keyframe()
+        return delta
+    
+    def revert_action(self, delta):
+        """Exact inverse of apply_action"""
+        player, action, origin, was_over = delta
+        kind, data = action
+        if kind == "move":
+            self.move_pawn(player, origin[0], origin[1])
+        else:
+            self.set_wall(data[0], data[1], data[2], False)
+            self.adjust_walls_remaining(player, 1)
+        self.current_player = player
+        self.game_over = was_over
     
     def undo_action(self):
         if not self.history:
             return False
-            
-        # Save current state to redo stack before undoing
-        current_state = {
-            "player_positions": copy.deepcopy(self.player_positions),
-            "horizontal_walls": copy.deepcopy(self.horizontal_walls),
-            "vertical_walls": copy.deepcopy(self.vertical_walls),
-            "current_player": self.current_player,
-            "walls_remaining": copy.deepcopy(self.walls_remaining),
-            "mode": self.mode,
-            "game_over": self.game_over,
-            "board_size": self.board_size,
-            "player_count": self.player_count
-        }
-        self.redo_stack.append(current_state)
-            
-        state = self.history.pop()
-        self.player_positions = state["player_positions"]
-        self.horizontal_walls = state["horizontal_walls"]
-        self.vertical_walls = state["vertical_walls"]
-        self.current_player = state["current_player"]
-        self.walls_remaining = state.get("walls_remaining", self.get_initial_walls(self.player_count, self.board_size))
+        
+        delta = self.history.pop()
+        self.revert_action(delta)
+        self.redo_stack.append(delta)
         self.mode = None
-        self.game_over = state.get("game_over", False)
         return True
     
     def redo_action(self):
         if not self.redo_stack:
             return False
-            
-        # Save current state to history before redoing
-        current_state = {
-            "player_positions": copy.deepcopy(self.player_positions),
-            "horizontal_walls": copy.deepcopy(self.horizontal_walls),
-            "vertical_walls": copy.deepcopy(self.vertical_walls),
-            "current_player": self.current_player,
-            "walls_remaining": copy.deepcopy(self.walls_remaining),
-            "mode": self.mode,
-            "game_over": self.game_over,
-            "board_size": self.board_size,
-            "player_count": self.player_count
-        }
-        self.history.append(current_state)
         
-        state = self.redo_stack.pop()
-        self.player_positions = state["player_positions"]
-        self.horizontal_walls = state["horizontal_walls"]
-        self.vertical_walls = state["vertical_walls"]
-        self.current_player = state["current_player"]
-        self.walls_remaining = state.get("walls_remaining", self.get_initial_walls(self.player_count, self.board_size))
+        delta = self.redo_stack.pop()
+        self.history.append(self.apply_action(delta[1], record=False))
+        self._add_keyframe()
         self.mode = None
-        self.game_over = state.get("game_over", False)
         return True
     
+    @property
+    def ply(self):
+        """Actions played since the start of the game, counting any dropped from history"""
+        return self.history.dropped + len(self.history)
+    
+    def jump_to_ply(self, ply):
+        """
+        Undo or redo to the position after ply actions. Starts from whichever
+        of the current position and the keyframes is closest, so it costs
+        the distance to that, not a replay from the start.
+        """
+        first = self.history.dropped
+        last = self.ply + len(self.redo_stack)
+        if not first <= ply <= last:
+            return False
+        
+        keyframe = self.keyframes.nearest(ply, first, last)
+        if keyframe is not None and abs(keyframe - ply) < abs(self.ply - ply):
+            self.restore_position(self.keyframes.position(keyframe, self.board_size, self.player_count))
+            # Only move the deltas across; the board is already at the keyframe
+            while self.ply > keyframe:
+                self.redo_stack.append(self.history.pop())
+            while self.ply < keyframe:
+                self.history.append(self.redo_stack.pop())
+        
+        while self.ply > ply:
+            self.undo_action()
+        while self.ply < ply:
+            self.redo_action()
+        self.mode = None
+        return True
+    
+    def clear_history(self):
+        """Forget undo and redo; the current position becomes ply 0"""
+        self.history.clear()
+        self.redo_stack.clear()
+        self.keyframes.clear()
+        self.keyframes.add(0, self)
+    
+    def _add_keyframe(self):
+        ply = self.ply
+        if ply % HISTORY_KEYFRAME_INTERVAL == 0 and ply not in self.keyframes.positions:
+            self.keyframes.add(ply, self)
+            self.keyframes.discard_before(self.history.dropped)
+    
+    def _deltas_from_snapshots(self, snapshots):
+        """Convert consecutive full-state snapshots from old save files into deltas"""
+        deltas = []
+        for before, after in zip(snapshots, snapshots[1:]):
+            player = before["current_player"]
+            old_pos = before["player_positions"][player]
+            new_pos = after["player_positions"][player]
+            if old_pos != new_pos:
+                deltas.append((player, ("move", tuple(new_pos)), tuple(old_pos), before.get("game_over", False)))
+                continue
+            
+            placed = None
+            for horizontal, key in ((True, "horizontal_walls"), (False, "vertical_walls")):
+                for r, row in enumerate(after[key]):
+                    for c, value in enumerate(row):
+                        if value and not before[key][r][c]:
+                            placed = (r, c, horizontal)
+            if placed is None:
+                # Failed actions in old files left duplicate snapshots behind
+                continue
+            deltas.append((player, ("wall", placed), None, before.get("game_over", False)))
+        return deltas
+    
     def save_to_file(self, filename):
-        """Save complete game state to file"""
-        state = {
-            "player_positions": self.player_positions,
-            "horizontal_walls": self.horizontal_walls,
-            "vertical_walls": self.vertical_walls,
-            "current_player": self.current_player,
-            "walls_remaining": self.walls_remaining,
-            "game_over": self.game_over,
-            "board_size": self.board_size,
-            "history": self.history,
-            "redo_stack": self.redo_stack,
-            "ai_players": self.ai_players,
-            "player_count": self.player_count
-        }
-        with open(filename, 'wb') as f:
-            pickle.dump(state, f)
+        """Save the game as its start position plus the list of actions played"""
+        savefile.write_game(self, filename)
     
     def load_from_file(self, filename):
-        """Load complete game state from file"""
+        """Load a saved game (binary save file, or a pickle from older versions)"""
         try:
             with open(filename, 'rb') as f:
-                state = pickle.load(f)
-            
-            self.player_positions = state["player_positions"]
-            self.horizontal_walls = state["horizontal_walls"]
-            self.vertical_walls = state["vertical_walls"]
-            self.current_player = state["current_player"]
-            self.walls_remaining = state["walls_remaining"]
-            self.game_over = state["game_over"]
-            self.board_size = state["board_size"]
-            self.history = state.get("history", [])
-            self.redo_stack = state.get("redo_stack", [])
-            self.ai_players = state.get("ai_players", {1: None, 2: None, 3: None, 4: None})
-            self.player_count = state.get("player_count", 2)
-            self.initial_positions = self.get_initial_positions(self.player_count, self.board_size)
+                magic = f.read(len(savefile.MAGIC))
+            # Replay into a scratch game so a file that fails halfway leaves this one untouched
+            loaded = GameState(self.board_size, self.player_count, self.ai_players, self.engine)
+            if magic == savefile.MAGIC:
+                loaded._load_record(savefile.read_game(filename))
+            else:
+                loaded._load_legacy(savefile.load_legacy_pickle(filename))
+            # Keep wall versions increasing so path caches never take the loaded walls for ours
+            loaded.wall_version += self.wall_version
+            self.__dict__.update(loaded.__dict__)
             return True
         except Exception as e:
-            print(f"Error loading game: {e}")
+            logger.error("Error loading game: %s", e)
             return False
     
+    def _load_record(self, record):
+        """Restore the nearest checkpoint and replay only the actions after it"""
+        self.reset_game(record.board_size, record.player_count, record.ai_players)
+        ply, position = record.nearest_checkpoint(len(record.actions))
+        self.restore_position(position)
+        for action in record.actions[ply:]:
+            self.apply_action(action, record=False)
+        history, redo_stack = record.deltas()
+        self.history.extend(history)
+        self.history.dropped += record.start_ply
+        self.redo_stack.extend(redo_stack)
+        # The save file's checkpoints are keyframes already
+        self.keyframes.clear()
+        self.keyframes.add_packed(record.start_ply, record.start)
+        for checkpoint_ply, packed in record.checkpoints.items():
+            self.keyframes.add_packed(record.start_ply + checkpoint_ply, packed)
+        self.keyframes.add(self.ply, self)
+    
+    def _load_legacy(self, state):
+        """Load the full-state dict written by older versions"""
+        self.player_positions = state["player_positions"]
+        self.restore_walls(state["horizontal_walls"], state["vertical_walls"])
+        self.current_player = state["current_player"]
+        self.walls_remaining = state["walls_remaining"]
+        self.game_over = state["game_over"]
+        self.board_size = state["board_size"]
+        history = state.get("history", [])
+        redo_stack = state.get("redo_stack", [])
+        if history and isinstance(history[0], dict):
+            history = self._deltas_from_snapshots(history + [state])
+        if redo_stack and isinstance(redo_stack[0], dict):
+            redo_stack = self._deltas_from_snapshots([state] + redo_stack[::-1])[::-1]
+        self.ai_players = state.get("ai_players", {1: None, 2: None, 3: None, 4: None})
+        self.player_count = state.get("player_count", 2)
+        self.initial_positions = self.get_initial_positions(self.player_count, self.board_size)
+        self.zobrist_key = self.compute_zobrist_key()
+        self.history.clear()
+        self.redo_stack.clear()
+        self.history.extend(history)
+        self.redo_stack.extend(redo_stack)
+        self.keyframes.clear()
+        self.keyframes.add(self.ply, self)
+    
     def switch_turn(self):
-        print(f"Switching turn from player {self.current_player} to player {self.get_next_player()}")
+        logger.debug("Switching turn from player %s to player %s", self.current_player, self.get_next_player())
         self.current_player = self.get_next_player()
     
     def get_next_player(self):
@@ -240,6 +489,29 @@ class GameState:
                 return 4
         return None
     
+    def clone(self):
+        """Independent copy of the current position, without undo history"""
+        other = GameState(self.board_size, self.player_count, dict(self.ai_players), engine=self.engine)
+        other.restore_position({
+            "horizontal_walls": self.horizontal_walls,
+            "vertical_walls": self.vertical_walls,
+            "player_positions": self.player_positions,
+            "walls_remaining": self.walls_remaining,
+            "current_player": self.current_player,
+            "game_over": self.game_over,
+        })
+        return other
+    
+    def restore_position(self, position):
+        """Set walls, pawns, wall supplies, side to move and game-over flag from a dict"""
+        self.restore_walls(position["horizontal_walls"], position["vertical_walls"])
+        for player, (row, col) in position["player_positions"].items():
+            self.move_pawn(player, row, col)
+        for player, count in position["walls_remaining"].items():
+            self.adjust_walls_remaining(player, count - self.walls_remaining[player])
+        self.current_player = position["current_player"]
+        self.game_over = position["game_over"]
+    
     def other_player_at(self, row, col):
         for p, pos in self.player_positions.items():
             if pos == [row, col]:
@@ -253,14 +525,13 @@ class GameState:
         self.current_player = 1
         self.mode = None
         self.legal_moves = []
-        self.history = []
-        self.redo_stack = []
         self.game_over = False
         self.ai_players = ai_players or {1: None, 2: None, 3: None, 4: None}
         
         self.initial_positions = self.get_initial_positions(player_count, board_size)
         self.player_positions = copy.deepcopy(self.initial_positions)
         
-        self.horizontal_walls = [[False] * (board_size - 1) for _ in range(board_size - 1)]
-        self.vertical_walls = [[False] * (board_size - 1) for _ in range(board_size - 1)]
-        self.walls_remaining = self.get_initial_walls(player_count, board_size)
\ No newline at end of file
+        self.init_walls(board_size)
+        self.walls_remaining = self.get_initial_walls(player_count, board_size)
+        self.zobrist_key = self.compute_zobrist_key()
+        self.clear_history()
\ No newline at end of file
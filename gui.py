@@ -1,13 +1,19 @@
 # gui.py
 
+import logging
+import os
+import time
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
 from constants import *
 from game_state import GameState
 from movement import Movement
 from wall_placement import WallPlacement
 from pathfinding import Pathfinding
-from ai import QuoridorAI
+from ai_worker import AIPlayer, AIWorker, PonderWorker
+import instrumentation
+
+logger = logging.getLogger(__name__)
 
 class QuoridorGUI:
     def __init__(self, root, board_size, player_count, ai_players):
@@ -20,12 +26,29 @@ class QuoridorGUI:
         self.wall_placement = WallPlacement(self.game_state)
         self.pathfinding = Pathfinding(self.game_state)
         
+        # One long-lived AI per AI seat, keeping its caches across turns of this game
+        self.ai_seats = {}
+        # Background search for the AI player to move, if any
+        self.ai_worker = None
+        # Canvas items kept between redraws: walls by slot, pawns by player
+        self.board_layout = None
+        self.wall_items = {}
+        self.pawn_items = {}
+        # AI move pacing: when the last AI move was shown, and pending unpaced redraws
+        self.last_ai_move_time = 0.0
+        self.display_dirty = False
+        self.frame_scheduled = False
+        # Set once "New Game" hands the window back to the start screen
+        self.closed = False
+        # "Pause AI" holds every AI seat, e.g. to step through a spectated game
+        self.ai_paused = False
+        
         self.setup_ui()
         self.bind_events()
         self.update_display()
         
         # Single AI check after a short delay
-        self.root.after(500, self.check_ai_move)
+        self.root.after(AI_MOVE_DELAY, self.check_ai_move)
     
     def setup_ui(self):
         # Configure root window
@@ -175,6 +198,17 @@ class QuoridorGUI:
         tk.Button(action_row1, text="New Game", command=self.new_game, 
                  bg="#FFFFCC", font=("Arial", 9), width=10).pack(side="left", padx=2)
         
+        # Jump straight to any ply still in the undo/redo history
+        jump_row = tk.Frame(self.game_controls_frame, bg="#EEEEEE")
+        jump_row.pack(fill="x", pady=3)
+        
+        tk.Label(jump_row, text="Go to ply:", font=("Arial", 9),
+                 bg="#EEEEEE").pack(side="left", padx=2)
+        self.ply_var = tk.StringVar(value="0")
+        tk.Entry(jump_row, textvariable=self.ply_var, font=("Arial", 9), width=6).pack(side="left", padx=2)
+        tk.Button(jump_row, text="Go", command=self.jump_to_ply, 
+                 bg=BUTTON_BG, font=("Arial", 9), width=4).pack(side="left", padx=2)
+        
         action_row2 = tk.Frame(self.game_controls_frame, bg="#EEEEEE")
         action_row2.pack(fill="x", pady=3)
         
@@ -182,6 +216,29 @@ class QuoridorGUI:
                  bg="#CCCCFF", font=("Arial", 9), width=12).pack(side="left", padx=2)
         tk.Button(action_row2, text="Load Game", command=self.load_game, 
                  bg="#FFCCCC", font=("Arial", 9), width=12).pack(side="left", padx=2)
+        
+        action_row3 = tk.Frame(self.game_controls_frame, bg="#EEEEEE")
+        action_row3.pack(fill="x", pady=3)
+        
+        self.stats_var = tk.BooleanVar(value=instrumentation.is_enabled())
+        tk.Checkbutton(action_row3, text="AI Stats", variable=self.stats_var, command=self.toggle_stats,
+                       bg="#EEEEEE", font=("Arial", 9)).pack(side="left", padx=2)
+        tk.Button(action_row3, text="Export Stats", command=self.export_stats, 
+                 bg=BUTTON_BG, font=("Arial", 9), width=12).pack(side="left", padx=2)
+        
+        # Pause between shown AI moves; 0 plays at full engine speed
+        action_row4 = tk.Frame(self.game_controls_frame, bg="#EEEEEE")
+        action_row4.pack(fill="x", pady=3)
+        
+        tk.Label(action_row4, text="AI delay (ms):", font=("Arial", 9),
+                 bg="#EEEEEE").pack(side="left", padx=2)
+        self.move_delay = tk.IntVar(value=AI_MOVE_DELAY)
+        tk.Scale(action_row4, from_=0, to=AI_MOVE_DELAY_MAX, resolution=100, orient="horizontal",
+                 variable=self.move_delay, length=140, bg="#EEEEEE", highlightthickness=0,
+                 font=("Arial", 8)).pack(side="left", padx=2)
+        self.pause_button = tk.Button(action_row4, text="Pause AI", command=self.toggle_ai_pause, 
+                                      bg=BUTTON_BG, font=("Arial", 9), width=9)
+        self.pause_button.pack(side="left", padx=2)
     
     def setup_info_display(self):
         # Main game information
@@ -194,6 +251,19 @@ class QuoridorGUI:
                                       bg="#EEEEEE", justify="left", anchor="w")
         self.ai_status_label.pack(fill="x", pady=2)
         
+        # AI thinking indicator
+        self.ai_progress_label = tk.Label(self.info_frame, text="", font=("Arial", 8), 
+                                        bg="#EEEEEE", justify="left", anchor="w")
+        self.ai_progress_label.pack(fill="x", pady=2)
+        self.ai_progress = ttk.Progressbar(self.info_frame, mode="indeterminate")
+        self.ai_progress.pack(fill="x", pady=2)
+        
+        # Per-move AI statistics, shown while "AI Stats" is ticked
+        self.stats_label = tk.Label(self.info_frame, text="", font=("Courier", 8), 
+                                  bg="#EEEEEE", justify="left", anchor="w")
+        if instrumentation.is_enabled():
+            self.stats_label.pack(fill="x", pady=2)
+        
         self.update_ai_status()
     
     def bind_events(self):
@@ -201,13 +271,19 @@ class QuoridorGUI:
     
     def update_display(self):
         self.draw_board()
+        self.draw_walls()
         self.draw_pawns()
-        self.draw_initial_positions()
         self.update_info()
     
     def draw_board(self):
-        self.canvas.delete("cell")
-        self.canvas.delete("wall")
+        """Draw cells and start markers once per board; later updates only touch what changed"""
+        layout = (self.game_state.board_size, tuple(sorted(self.game_state.initial_positions.items())))
+        if layout == self.board_layout:
+            return
+        self.board_layout = layout
+        self.canvas.delete("cell", "wall", "pawn", "initial_position")
+        self.wall_items = {}
+        self.pawn_items = {}
         board_size = self.game_state.board_size
         for row in range(board_size):
             for col in range(board_size):
@@ -216,33 +292,39 @@ class QuoridorGUI:
                 x2 = x1 + CELL_SIZE
                 y2 = y1 + CELL_SIZE
                 self.canvas.create_rectangle(x1, y1, x2, y2, fill=BOARD_COLOR, outline=LINE_COLOR, width=2, tags="cell")
-        self.draw_walls()
+        self.draw_initial_positions()
     
     def draw_walls(self):
-        board_size = self.game_state.board_size
-        for row in range(board_size - 1):
-            for col in range(board_size - 1):
-                if self.game_state.horizontal_walls[row][col]:
-                    self.draw_horizontal_wall(row, col)
-                if self.game_state.vertical_walls[row][col]:
-                    self.draw_vertical_wall(row, col)
+        """Add and remove wall items to match the walls on the board"""
+        walls = self.game_state.placed_walls
+        for wall in [w for w in self.wall_items if w not in walls]:
+            self.canvas.delete(self.wall_items.pop(wall))
+        for row, col, horizontal in walls:
+            if (row, col, horizontal) not in self.wall_items:
+                if horizontal:
+                    item = self.draw_horizontal_wall(row, col)
+                else:
+                    item = self.draw_vertical_wall(row, col)
+                self.wall_items[(row, col, horizontal)] = item
+                # Keep walls just above the cells, under pawns and start markers
+                self.canvas.tag_raise(item, "cell")
     
     def draw_horizontal_wall(self, row, col):
         x1 = PADDING + col * (CELL_SIZE + GAP_SIZE)
         y1 = PADDING + (row + 1) * CELL_SIZE + row * GAP_SIZE
         x2 = x1 + 2 * CELL_SIZE + GAP_SIZE
         y2 = y1 + GAP_SIZE
-        self.canvas.create_rectangle(x1, y1, x2, y2, fill=WALL_COLOR, width=0, tags="wall")
+        return self.canvas.create_rectangle(x1, y1, x2, y2, fill=WALL_COLOR, width=0, tags="wall")
     
     def draw_vertical_wall(self, row, col):
         x1 = PADDING + (col + 1) * CELL_SIZE + col * GAP_SIZE
         y1 = PADDING + row * (CELL_SIZE + GAP_SIZE)
         x2 = x1 + GAP_SIZE
         y2 = y1 + 2 * CELL_SIZE + GAP_SIZE
-        self.canvas.create_rectangle(x1, y1, x2, y2, fill=WALL_COLOR, width=0, tags="wall")
+        return self.canvas.create_rectangle(x1, y1, x2, y2, fill=WALL_COLOR, width=0, tags="wall")
     
     def draw_pawns(self):
-        self.canvas.delete("pawn")
+        """Create each pawn once, then move it with canvas.coords"""
         player_colors = {
             1: PLAYER1_COLOR,
             2: PLAYER2_COLOR,
@@ -251,16 +333,21 @@ class QuoridorGUI:
         }
         
         for player, (row, col) in self.game_state.player_positions.items():
-            color = player_colors[player]
             x1 = PADDING + col * (CELL_SIZE + GAP_SIZE) + 10
             y1 = PADDING + row * (CELL_SIZE + GAP_SIZE) + 10
             x2 = x1 + CELL_SIZE - 20
             y2 = y1 + CELL_SIZE - 20
-            self.canvas.create_oval(x1, y1, x2, y2, fill=color, tags="pawn")
+            item = self.pawn_items.get(player)
+            if item is None:
+                item = self.canvas.create_oval(x1, y1, x2, y2, fill=player_colors[player], tags="pawn")
+                self.pawn_items[player] = item
+                # Start markers stay drawn over the pawns
+                self.canvas.tag_lower(item, "initial_position")
+            elif self.canvas.coords(item) != [x1, y1, x2, y2]:
+                self.canvas.coords(item, x1, y1, x2, y2)
     
     def draw_initial_positions(self):
         """Draw empty circles to indicate initial positions"""
-        self.canvas.delete("initial_position")
         player_colors = {
             1: PLAYER1_COLOR,
             2: PLAYER2_COLOR,
@@ -316,88 +403,219 @@ class QuoridorGUI:
     
     def check_ai_move(self):
         """Check if current player is AI and make move if so"""
-        if self.game_state.game_over:
+        if self.closed or self.ai_paused or self.game_state.game_over:
             return
             
         current_player = self.game_state.current_player
         ai_difficulty = self.game_state.ai_players[current_player]
         
         # Debug info
-        print(f"Checking AI move: Player {current_player}, AI: {ai_difficulty}, Mode: {self.game_state.mode}")
+        logger.debug("Checking AI move: Player %s, AI: %s, Mode: %s", current_player, ai_difficulty, self.game_state.mode)
         
         if ai_difficulty and not self.game_state.mode:
+            if self.ai_worker is not None:
+                return  # already thinking
             try:
-                # AI's turn - make a move after a short delay
+                # AI's turn - search on a background thread, poll for the result
                 self.info_label.config(text=f"AI Player {current_player} thinking...")
-                print(f"Scheduling AI move for player {current_player} with difficulty {ai_difficulty}")
-                self.root.after(800, self.make_ai_move, current_player, ai_difficulty)
+                logger.debug("Starting AI search for player %s with difficulty %s", current_player, ai_difficulty)
+                worker = AIWorker(self.ai_seat(current_player), self.game_state)
+                self.ai_worker = worker
+                worker.start()
+                self.ai_progress.start()
+                self.root.after(AI_POLL_INTERVAL, self.poll_ai_move, worker)
             except Exception as e:
-                print(f"Error in AI move: {e}")
+                logger.error("Error in AI move: %s", e)
                 self.info_label.config(text=f"AI error: {str(e)}")
+                self.ai_worker = None
                 self.game_state.switch_turn()
                 self.update_display()
+        elif not ai_difficulty:
+            self.start_pondering()
+
+    def toggle_ai_pause(self):
+        """Stop or restart AI play without touching the game history"""
+        self.ai_paused = not self.ai_paused
+        if self.ai_paused:
+            self.cancel_ai_move()
+            self.pause_button.config(text="Resume AI")
+            self.info_label.config(text="AI paused")
+        else:
+            self.pause_button.config(text="Pause AI")
+            self.root.after_idle(self.check_ai_move)
+
+    def ai_seat(self, player):
+        """The long-lived AI for an AI player's seat"""
+        seat = self.ai_seats.get(player)
+        if seat is None:
+            seat = self.ai_seats[player] = AIPlayer(player, self.game_state.ai_players[player])
+        return seat
+
+    def start_pondering(self):
+        """Let a hard AI moving next search its answers while a human is to move"""
+        gs = self.game_state
+        if gs.game_over or gs.ai_players[gs.current_player]:
+            return
+        next_player = gs.get_next_player()
+        if gs.ai_players[next_player] != "hard":
+            return
+        seat = self.ai_seat(next_player)
+        worker = seat.worker
+        if (isinstance(worker, PonderWorker) and not worker.cancelled
+                and worker.position_key == gs.zobrist_key):
+            return  # already pondering this position
+        logger.debug("AI player %s pondering during player %s's turn", next_player, gs.current_player)
+        PonderWorker(seat, gs).start()
+
+    def poll_ai_move(self, worker):
+        """Play the background AI's move as soon as it is ready"""
+        if worker is not self.ai_worker:
+            return  # cancelled
+        
+        result = worker.poll()
+        if result is None:
+            self.ai_progress_label.config(text=f"AI Player {worker.player} thinking ({worker.progress()})")
+            # Unpaced play polls as often as Tk allows
+            self.root.after(AI_POLL_INTERVAL if self.move_delay.get() else 1, self.poll_ai_move, worker)
+            return
+        
+        # Hold the move until the chosen delay since the last one has passed
+        wait = int(self.move_delay.get() - 1000 * (time.perf_counter() - self.last_ai_move_time))
+        if wait > 0:
+            self.root.after(wait, self.finish_ai_move, worker, result)
+        else:
+            self.finish_ai_move(worker, result)
+
+    def finish_ai_move(self, worker, result):
+        """Play a finished search's move, unless it was cancelled or the position moved on"""
+        if worker is not self.ai_worker:
+            return  # cancelled while held back
+        self.ai_worker = None
+        self.ai_progress.stop()
+        self.ai_progress_label.config(text="")
+        kind, value = result
+        if kind == "error":
+            logger.error("Error during AI search: %s", value)
+            self.info_label.config(text=f"AI move error: {str(value)}")
+            # Force switch turn to prevent game lock
+            self.game_state.switch_turn()
+            self.update_display()
+            return
+        
+        if self.game_state.zobrist_key != worker.position_key:
+            # The position changed while the AI was thinking
+            logger.debug("Discarding AI move for a stale position")
+            self.check_ai_move()
+            return
+        self.update_stats_panel()
+        self.last_ai_move_time = time.perf_counter()
+        self.make_ai_move(worker.player, value)
+
+    def toggle_stats(self):
+        """Switch per-move AI statistics and their panel on or off"""
+        enabled = self.stats_var.get()
+        instrumentation.enable(enabled)
+        if enabled:
+            self.stats_label.pack(fill="x", pady=2)
+            self.update_stats_panel()
+        else:
+            self.stats_label.pack_forget()
+
+    def update_stats_panel(self):
+        if not instrumentation.is_enabled():
+            return
+        record = instrumentation.recorder.last()
+        if record is None:
+            self.stats_label.config(text="No AI moves recorded yet")
+            return
+        self.stats_label.config(text=(
+            f"Last AI move: P{record['player']} {record['difficulty']}, {record['wall_time_ms']:.0f} ms\n"
+            f"nodes {record['nodes']}  depth {record['depth']}  BFS {record['bfs_calls']}\n"
+            f"walls tried {record['walls_tried']}  map hits {record['distance_cache_hits']}\n"
+            f"TT hits {record['tt_hits']}/{record['tt_probes']}  "
+            f"moves recorded {len(instrumentation.recorder.records)}"))
+
+    def export_stats(self):
+        """Append recorded AI move statistics to a JSON-lines file"""
+        count = instrumentation.recorder.export_jsonl(STATS_FILE)
+        instrumentation.recorder.clear()
+        self.info_label.config(text=f"Exported {count} AI moves to {STATS_FILE}")
 
-    def make_ai_move(self, player, difficulty):
+    def cancel_ai_move(self):
+        """Stop background AI searches and pondering whose results are no longer wanted"""
+        for seat in self.ai_seats.values():
+            if isinstance(seat.worker, PonderWorker):
+                seat.stop()
+        if self.ai_worker is None:
+            return
+        self.ai_worker.cancel()
+        self.ai_worker = None
+        self.ai_progress.stop()
+        self.ai_progress_label.config(text="")
+
+    def make_ai_move(self, player, move):
         """Execute AI move"""
-        print(f"Executing AI move for player {player} with difficulty {difficulty}")
+        logger.debug("Executing AI move for player %s: %s", player, move)
         
         # Ensure it's still the AI's turn
         if self.game_state.current_player != player:
-            print(f"Not AI's turn anymore. Current player: {self.game_state.current_player}")
+            logger.debug("Not AI's turn anymore. Current player: %s", self.game_state.current_player)
             return
             
         try:
-            ai = QuoridorAI(self.game_state, difficulty)
-            move = ai.get_move()
-            
             if not move:
                 self.info_label.config(text=f"AI Player {player} has no valid moves")
-                print(f"AI found no valid moves")
+                logger.warning("AI found no valid moves")
                 return
             
             move_type, move_data = move
-            print(f"AI decided: {move_type} at {move_data}")
+            logger.debug("AI decided: %s at %s", move_type, move_data)
             
-            self.game_state.save_game_state()
-            
-            if move_type == "move":
-                row, col = move_data
-                self.game_state.player_positions[player] = [row, col]
-                
-                winner = self.game_state.check_victory()
-                if winner:
-                    self.handle_game_over(winner)
-                    return
-                    
-                self.game_state.switch_turn()
-                self.update_display()
-                
-            elif move_type == "wall":
+            if move_type == "wall":
                 row, col, horizontal = move_data
-                success, message = self.wall_placement.place_wall(row, col, horizontal, self.pathfinding)
-                
-                if success:
-                    self.game_state.switch_turn()
-                    self.update_display()
-                else:
+                valid, message = self.wall_placement.is_valid_wall_placement(row, col, horizontal)
+                if valid and not self.wall_placement.keeps_paths(row, col, horizontal, self.pathfinding):
+                    valid, message = False, "Wall would block a player's path"
+                if not valid:
                     # If wall placement failed, try a move instead
-                    print(f"AI wall placement failed: {message}, trying move instead")
+                    logger.warning("AI wall placement failed: %s, trying move instead", message)
                     legal_moves = self.movement.get_legal_moves(player)
-                    if legal_moves:
-                        row, col = legal_moves[0]  # Pick first legal move
-                        self.game_state.player_positions[player] = [row, col]
-                        self.game_state.switch_turn()
-                        self.update_display()
-                    else:
+                    if not legal_moves:
                         self.info_label.config(text="AI has no legal moves")
-                        print("AI has no legal moves after failed wall placement")
+                        logger.warning("AI has no legal moves after failed wall placement")
+                        return
+                    move = ("move", legal_moves[0])  # Pick first legal move
+
+            self.game_state.apply_action(move)
+            if self.game_state.game_over:
+                self.handle_game_over(player)
+                return
+            self.refresh_display()
+            # The next player may be an AI too
+            self.root.after_idle(self.check_ai_move)
         except Exception as e:
-            print(f"Error during AI move execution: {e}")
+            logger.error("Error during AI move execution: %s", e)
             self.info_label.config(text=f"AI move error: {str(e)}")
             # Force switch turn to prevent game lock
             self.game_state.switch_turn()
             self.update_display()
     
+    def refresh_display(self):
+        """Redraw now, or at most SPECTATOR_FPS times a second while AI moves are unpaced"""
+        if self.move_delay.get():
+            self.update_display()
+            return
+        self.display_dirty = True
+        if not self.frame_scheduled:
+            self.frame_scheduled = True
+            self.root.after(1000 // SPECTATOR_FPS, self.render_frame)
+    
+    def render_frame(self):
+        self.frame_scheduled = False
+        if self.display_dirty and not self.closed:
+            self.display_dirty = False
+            self.update_display()
+    
     def handle_game_over(self, winner):
         self.game_state.game_over = True
         self.game_state.mode = None
@@ -452,20 +670,17 @@ class QuoridorGUI:
             self.info_label.config(text="Illegal move")
             return
             
-        self.game_state.save_game_state()
-        self.game_state.player_positions[self.game_state.current_player] = [row, col]
-        
-        winner = self.game_state.check_victory()
-        if winner:
-            self.handle_game_over(winner)
+        player = self.game_state.current_player
+        self.game_state.apply_action(("move", (row, col)))
+        if self.game_state.game_over:
+            self.handle_game_over(player)
             return
 
-        self.game_state.switch_turn()
         self.game_state.mode = None
         self.canvas.delete("highlight")
         self.update_display()
         # Check if next player is AI
-        self.root.after(500, self.check_ai_move)
+        self.root.after_idle(self.check_ai_move)
     
     def preview_wall(self, row, col):
         board_size = self.game_state.board_size
@@ -496,7 +711,6 @@ class QuoridorGUI:
         self.canvas.create_rectangle(x1, y1, x2, y2, fill=WALL_PREVIEW_COLOR, width=0, tags="highlight")
     
     def place_wall(self, row, col):
-        self.game_state.save_game_state()
         horizontal = (self.game_state.mode == "H_wall")
         success, message = self.wall_placement.place_wall(row, col, horizontal, self.pathfinding)
         
@@ -507,63 +721,95 @@ class QuoridorGUI:
             self.game_state.mode = None
             return
             
-        self.game_state.switch_turn()
         self.game_state.mode = None
         self.canvas.delete("highlight")
         self.update_display()
         self.canvas.unbind("<Button-3>")
         # Check if next player is AI
-        self.root.after(500, self.check_ai_move)
+        self.root.after_idle(self.check_ai_move)
     
     def undo_action(self):
-        if self.game_state.undo_action():
-            self.canvas.delete("highlight")
-            self.update_display()
-            if self.game_state.mode == "move":
-                self.game_state.legal_moves = self.movement.get_legal_moves(self.game_state.current_player)
-                self.highlight_legal_moves()
-        else:
+        # Check first so a refused undo leaves the AI's search running
+        if not self.game_state.history:
             self.info_label.config(text="No action to undo")
+            return
+        self.cancel_ai_move()
+        self.game_state.undo_action()
+        self.resume_after_navigation()
     
     def redo_action(self):
-        if self.game_state.redo_action():
-            self.canvas.delete("highlight")
-            self.update_display()
-            if self.game_state.mode == "move":
-                self.game_state.legal_moves = self.movement.get_legal_moves(self.game_state.current_player)
-                self.highlight_legal_moves()
-        else:
+        if not self.game_state.redo_stack:
             self.info_label.config(text="No action to redo")
+            return
+        self.cancel_ai_move()
+        self.game_state.redo_action()
+        self.resume_after_navigation()
+    
+    def resume_after_navigation(self):
+        """Redraw after undo, redo, a jump or load, and let an AI to move (or pondering) carry on"""
+        self.canvas.delete("highlight")
+        self.update_display()
+        if self.game_state.mode == "move":
+            self.game_state.legal_moves = self.movement.get_legal_moves(self.game_state.current_player)
+            self.highlight_legal_moves()
+        # The search cancelled above is not coming back; start the next one
+        self.root.after_idle(self.check_ai_move)
+    
+    def jump_to_ply(self):
+        # Validate first so a refused jump leaves the AI's search running
+        try:
+            ply = int(self.ply_var.get())
+        except ValueError:
+            self.info_label.config(text="Enter a ply number")
+            return
+        first = self.game_state.history.dropped
+        last = self.game_state.ply + len(self.game_state.redo_stack)
+        if not first <= ply <= last:
+            self.info_label.config(text=f"Ply must be between {first} and {last}")
+            return
+        self.cancel_ai_move()
+        self.game_state.jump_to_ply(ply)
+        self.resume_after_navigation()
     
     def save_game(self):
         """Save current game state to file"""
-        filename = "quoridor_save.pkl"
+        filename = SAVE_FILE
         self.game_state.save_to_file(filename)
         self.info_label.config(text="Game saved successfully!")
     
     def load_game(self):
         """Load game state from file"""
-        filename = "quoridor_save.pkl"
+        filename = SAVE_FILE if os.path.exists(SAVE_FILE) else LEGACY_SAVE_FILE
+        if not os.path.exists(filename):
+            self.info_label.config(text="No saved game to load")
+            return
+        self.cancel_ai_move()
         if self.game_state.load_from_file(filename):
             # Reinitialize components with new game state
             self.movement = Movement(self.game_state)
             self.wall_placement = WallPlacement(self.game_state)
             self.pathfinding = Pathfinding(self.game_state)
+            self.ai_seats = {}
             
             # Update canvas size for potentially different board size
             canvas_size = (CELL_SIZE + GAP_SIZE) * self.game_state.board_size + PADDING * 2 - GAP_SIZE
             self.canvas.config(width=canvas_size, height=canvas_size)
             
-            self.update_display()
+            self.resume_after_navigation()
             self.info_label.config(text="Game loaded successfully!")
         else:
             self.info_label.config(text="Error loading game file")
+            # The game is unchanged, but its cancelled search (or pondering) must restart
+            self.root.after_idle(self.check_ai_move)
     
     def new_game(self):
         """Return to start screen for new game"""
         from main import show_start_screen
-        self.root.destroy()
-        show_start_screen()
+        self.cancel_ai_move()
+        # Callbacks still queued for this game must not touch the cleared window
+        self.closed = True
+        instrumentation.startup.restart()
+        show_start_screen(self.root)
     
     def update_info(self):
         if self.game_state.game_over:
@@ -0,0 +1,142 @@
+# history.py
+
+import struct
+import zlib
+from constants import *
+from savefile import encode_action, decode_action, encode_position, decode_position
+
+# One delta in four bytes: the action's u16 save-file code, the moving
+# pawn's origin (row << 4 | col, or NO_ORIGIN for walls) and a flag byte
+# holding the player and the game-over flag before the action
+RECORD = struct.Struct("<HBB")
+NO_ORIGIN = 0xFF
+GAME_OVER_FLAG = 0x08
+
+class DeltaLog:
+    """
+    GameState undo or redo deltas, packed into a bounded ring buffer.
+
+    Behaves like the list of (player, action, origin, game_over) tuples it
+    replaces: append, pop, len, indexing and iteration oldest first. Once
+    capacity deltas are stored, each append drops the oldest one; dropped
+    counts them so plies keep their numbers. The buffer grows with the
+    game up to capacity, so short games stay small.
+    """
+    def __init__(self, capacity=HISTORY_CAPACITY):
+        self.capacity = capacity
+        self.buffer = bytearray()
+        self.head = 0     # slot of the oldest delta
+        self.count = 0
+        self.dropped = 0  # deltas pushed out of the ring so far
+
+    def append(self, delta):
+        if self.count == self.capacity:
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            self.dropped += 1
+        offset = (self.head + self.count) % self.capacity * RECORD.size
+        if offset == len(self.buffer):
+            self.buffer.extend(bytes(RECORD.size))
+        RECORD.pack_into(self.buffer, offset, *_pack(delta))
+        self.count += 1
+
+    def extend(self, deltas):
+        for delta in deltas:
+            self.append(delta)
+
+    def pop(self):
+        if not self.count:
+            raise IndexError("pop from empty history")
+        self.count -= 1
+        return self._unpack(self.count)
+
+    def clear(self):
+        self.buffer = bytearray()
+        self.head = 0
+        self.count = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("history index out of range")
+        return self._unpack(index)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self._unpack(index)
+
+    def __reversed__(self):
+        for index in range(self.count - 1, -1, -1):
+            yield self._unpack(index)
+
+    @property
+    def nbytes(self):
+        return len(self.buffer)
+
+    def _unpack(self, index):
+        offset = (self.head + index) % self.capacity * RECORD.size
+        code, origin, flags = RECORD.unpack_from(self.buffer, offset)
+        if origin != NO_ORIGIN:
+            origin = (origin >> 4, origin & 0xF)
+        else:
+            origin = None
+        return (flags & 0x07, decode_action(code), origin, bool(flags & GAME_OVER_FLAG))
+
+
+def _pack(delta):
+    player, action, origin, was_over = delta
+    code = struct.unpack("<H", encode_action(action))[0]
+    packed_origin = NO_ORIGIN if origin is None else (origin[0] << 4) | origin[1]
+    return code, packed_origin, player | (GAME_OVER_FLAG if was_over else 0)
+
+
+class Keyframes:
+    """
+    Full positions saved every HISTORY_KEYFRAME_INTERVAL plies, so any ply
+    can be reached by restoring the closest one and replaying only the
+    actions in between. Positions are bit-packed as in save files and,
+    with compress, also deflated.
+    """
+    def __init__(self, compress=HISTORY_COMPRESS):
+        self.compress = compress
+        self.positions = {}  # ply -> packed position
+
+    def add(self, ply, game_state):
+        self.add_packed(ply, encode_position(game_state))
+
+    def add_packed(self, ply, packed):
+        if self.compress:
+            deflate = zlib.compressobj(9, zlib.DEFLATED, -15)
+            packed = deflate.compress(packed) + deflate.flush()
+        self.positions[ply] = packed
+
+    def position(self, ply, board_size, player_count):
+        packed = self.positions[ply]
+        if self.compress:
+            packed = zlib.decompress(packed, -15)
+        return decode_position(packed, board_size, player_count)
+
+    def nearest(self, ply, low, high):
+        """Keyframe ply in [low, high] closest to ply, or None"""
+        usable = [k for k in self.positions if low <= k <= high]
+        return min(usable, key=lambda k: abs(k - ply)) if usable else None
+
+    def discard_before(self, ply):
+        for k in [k for k in self.positions if k < ply]:
+            del self.positions[k]
+
+    def discard_after(self, ply):
+        for k in [k for k in self.positions if k > ply]:
+            del self.positions[k]
+
+    def clear(self):
+        self.positions = {}
+
+    @property
+    def nbytes(self):
+        return sum(len(packed) for packed in self.positions.values())
@@ -0,0 +1,139 @@
+# instrumentation.py
+
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class Counters:
+    """
+    Running totals bumped by the hot paths.
+
+    Always on: each bump is one integer add, cheaper than testing a flag.
+    Per-move figures are differences between two snapshots.
+    """
+    FIELDS = ("bfs_calls", "distance_cache_hits", "walls_tried")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.bfs_calls = 0
+        self.distance_cache_hits = 0
+        self.walls_tried = 0
+
+    def snapshot(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+counters = Counters()
+
+
+class MoveRecorder:
+    """
+    Statistics for each AI move, collected only while enabled.
+
+    A record holds the player, difficulty, chosen move, wall time and the
+    work done for it: BFS runs, distance-map cache hits, candidate walls
+    tried, search nodes and depth, and transposition-table probes/hits.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+
+    def begin(self, ai):
+        """Start measuring a move; returns a token for end(), or None when disabled"""
+        if not self.enabled:
+            return None
+        return (time.perf_counter(), counters.snapshot(), _table_counts(ai.transposition_table))
+
+    def end(self, token, ai, move):
+        if token is None:
+            return None
+        started, before, table_before = token
+        elapsed = time.perf_counter() - started
+        after = counters.snapshot()
+
+        engine = ai.engine
+        table = engine.table if engine is not None else ai.transposition_table
+        if table is not ai.transposition_table:
+            table_before = (0, 0)
+        probes, hits = _table_counts(table)
+
+        record = {
+            "time": time.time(),
+            "player": ai.game_state.current_player,
+            "difficulty": ai.difficulty,
+            "board_size": ai.game_state.board_size,
+            "move": move,
+            "wall_time_ms": 1000 * elapsed,
+            "nodes": engine.nodes if engine is not None else 0,
+            "depth": engine.depth_reached if engine is not None else 0,
+            "tt_probes": probes - table_before[0],
+            "tt_hits": hits - table_before[1],
+        }
+        for name in Counters.FIELDS:
+            record[name] = after[name] - before[name]
+        self.records.append(record)
+        return record
+
+    def last(self):
+        return self.records[-1] if self.records else None
+
+    def clear(self):
+        self.records = []
+
+    def export_jsonl(self, filename):
+        """Append all records to a JSON-lines file, one move per line"""
+        with open(filename, "a") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+        return len(self.records)
+
+
+def _table_counts(table):
+    if table is None:
+        return (0, 0)
+    return (table.probes, table.hits)
+
+
+recorder = MoveRecorder()
+
+def enable(flag=True):
+    """Turn per-move AI statistics on or off"""
+    recorder.enabled = flag
+
+def is_enabled():
+    return recorder.enabled
+
+
+class StartupTimer:
+    """
+    Wall-clock marks from launch to the first board, shown with main.py --timing.
+
+    Marks are kept only while enabled. restart() begins a new measurement,
+    so a second game from "New Game" reports the warm path on its own.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.restart()
+
+    def restart(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.marks = []
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append((name, time.perf_counter()))
+
+    def report(self):
+        lines = ["Startup timing (ms):"]
+        previous = self.started
+        for name, at in sorted(self.marks, key=lambda mark: mark[1]):
+            lines.append(f"  {name:<36} +{1000 * (at - previous):7.1f}  {1000 * (at - self.started):8.1f}")
+            previous = at
+        return "\n".join(lines)
+
+
+startup = StartupTimer()
@@ -1,24 +1,63 @@
 # main.py
 
+import time
+_launched = time.perf_counter()
+
+import logging
+import sys
+import threading
 import tkinter as tk
+import instrumentation
 from start_screen import StartScreen
-from gui import QuoridorGUI
 
-def show_start_screen():
-    """Show the start screen"""
-    root = tk.Tk()
-    start_screen = StartScreen(root, start_game)
-    root.mainloop()
+# The game window and the AI engine (gui, ai, search, NumPy when present)
+# are only imported once the start screen is up, on a background thread
+
+def preload_engine():
+    """Import the game window and AI modules while the user picks settings"""
+    import gui
+    instrumentation.startup.mark("engine modules loaded (background)")
+
+def show_start_screen(root=None):
+    """Show the start screen in root, or in a new window when there is none yet"""
+    if root is None:
+        root = tk.Tk()
+    else:
+        for widget in root.winfo_children():
+            widget.destroy()
+    StartScreen(root, lambda *settings: start_game(root, *settings))
+    root.after_idle(instrumentation.startup.mark, "start screen shown")
+    return root
 
-def start_game(board_size, player_count, ai_settings):
-    """Start the game with the selected settings"""
-    # Close the start screen and start the main game
-    root = tk.Tk()
+def start_game(root, board_size, player_count, ai_settings):
+    """Start the game with the selected settings, in the start screen's window"""
+    instrumentation.startup.mark("settings chosen")
+    # Waits for the background import if it is still running
+    from gui import QuoridorGUI
+    for widget in root.winfo_children():
+        widget.destroy()
+    root.resizable(True, True)
     
     # Start the main game
     app = QuoridorGUI(root, board_size, player_count, ai_settings)
-    
-    root.mainloop()
+    root.after_idle(board_shown)
+
+def board_shown():
+    instrumentation.startup.mark("game board shown")
+    if instrumentation.startup.enabled:
+        print(instrumentation.startup.report())
 
 if __name__ == "__main__":
-    show_start_screen()
\ No newline at end of file
+    # --debug shows diagnostic logging, --stats records per-move AI statistics,
+    # --timing prints how long the start screen and the board took to appear
+    logging.basicConfig(level=logging.DEBUG if "--debug" in sys.argv else logging.WARNING,
+                        format="%(levelname)s %(name)s: %(message)s")
+    if "--stats" in sys.argv:
+        instrumentation.enable()
+    if "--timing" in sys.argv:
+        instrumentation.startup.enabled = True
+        instrumentation.startup.restart(_launched)
+        instrumentation.startup.mark("start screen modules imported")
+    root = show_start_screen()
+    threading.Thread(target=preload_engine, daemon=True).start()
+    root.mainloop()
@@ -6,6 +6,10 @@ class Movement:
     
     def is_blocked_between(self, r1, c1, r2, c2):
         """Check if movement between two adjacent cells is blocked by a wall"""
+        bitboard = self.game_state.bitboard
+        if bitboard is not None:
+            return bitboard.is_blocked_between(r1, c1, r2, c2)
+        
         board_size = self.game_state.board_size
         
         if abs(r1 - r2) + abs(c1 - c2) != 1:
@@ -96,5 +100,5 @@ class Movement:
         if (row, col) not in legal_moves:
             return False
             
-        self.game_state.player_positions[player] = [row, col]
+        self.game_state.move_pawn(player, row, col)
         return True
\ No newline at end of file
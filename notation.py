@@ -0,0 +1,51 @@
+# notation.py
+
+import re
+from constants import *
+
+# Columns are letters from the left, rows are numbers from the top row
+# (player 1's side), so player 1 starts on e1 of a 9x9 board. A wall is
+# named by the top-left cell of the four it touches plus "h" or "v":
+# "e3h" is the horizontal wall slot (row 2, column 4).
+COLUMNS = "abcdefghijklmnopqrstuvwxyz"
+
+_ACTION = re.compile(r"([a-z])(\d{1,2})([hv]?)$")
+_HEADER = re.compile(r"(\d{1,2})x\1/([24])$")
+
+def format_action(action):
+    """("move", (r, c)) -> "e2", ("wall", (r, c, horizontal)) -> "e2h" """
+    kind, data = action
+    text = f"{COLUMNS[data[1]]}{data[0] + 1}"
+    if kind == "wall":
+        text += "h" if data[2] else "v"
+    return text
+
+def parse_action(text, board_size):
+    """Inverse of format_action; raises ValueError for bad or off-board squares"""
+    match = _ACTION.match(text.strip().lower())
+    if not match:
+        raise ValueError(f"Bad move notation: {text!r}")
+    col = COLUMNS.index(match.group(1))
+    row = int(match.group(2)) - 1
+    orientation = match.group(3)
+    limit = board_size - 1 if orientation else board_size
+    if not (0 <= row < limit and 0 <= col < limit):
+        raise ValueError(f"{text!r} is off a {board_size}x{board_size} board")
+    if orientation:
+        return ("wall", (row, col, orientation == "h"))
+    return ("move", (row, col))
+
+def format_game(board_size, player_count, actions):
+    """One game on one line: "9x9/2 e2 e8 e3h ..." """
+    return " ".join([f"{board_size}x{board_size}/{player_count}"] + [format_action(a) for a in actions])
+
+def parse_game(line):
+    """(board_size, player_count, actions) from a format_game line"""
+    tokens = line.split()
+    match = _HEADER.match(tokens[0]) if tokens else None
+    if not match:
+        raise ValueError(f"Game record must start with a size/players tag like 9x9/2: {line.strip()[:20]!r}")
+    board_size, player_count = int(match.group(1)), int(match.group(2))
+    if not MIN_BOARD_SIZE <= board_size <= MAX_BOARD_SIZE:
+        raise ValueError(f"Unsupported board size {board_size}")
+    return board_size, player_count, [parse_action(token, board_size) for token in tokens[1:]]
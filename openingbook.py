@@ -0,0 +1,128 @@
+# openingbook.py
+
+import argparse
+import mmap
+import os
+import struct
+from constants import *
+from savefile import encode_action, decode_action
+
+MAGIC = b"QRDB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sII")   # magic, version, entry count
+ENTRY = struct.Struct("<QHII")    # position key, action code, games, wins
+
+class OpeningBook:
+    """
+    Read-only opening book: entries sorted by Zobrist key in a memory-mapped
+    file, found by binary search without loading the file into memory.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{filename} is not an opening book of version {FORMAT_VERSION}")
+        if len(self.data) < HEADER.size + self.count * ENTRY.size:
+            raise ValueError(f"{filename} is truncated")
+
+    def lookup(self, key):
+        """(action, games, wins) stored for the position, or None"""
+        data = self.data
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            entry_key, code, games, wins = ENTRY.unpack_from(data, HEADER.size + mid * ENTRY.size)
+            if entry_key == key:
+                return decode_action(code), games, wins
+            if entry_key < key:
+                low = mid + 1
+            else:
+                high = mid
+        return None
+
+    def close(self):
+        self.data.close()
+
+
+_default_book = None
+_default_loaded = False
+
+def default_book():
+    """The book in OPENING_BOOK_FILE, opened once; None if there is none"""
+    global _default_book, _default_loaded
+    if not _default_loaded:
+        _default_loaded = True
+        if os.path.exists(OPENING_BOOK_FILE):
+            _default_book = OpeningBook(OPENING_BOOK_FILE)
+    return _default_book
+
+
+def collect_stats(lines, plies=OPENING_BOOK_PLIES):
+    """key -> {action: [games, wins]} over the first plies of every valid game line"""
+    # Only needed to build a book, so looking moves up stays cheap to import
+    from notation import parse_game
+    from replay import Replayer, IllegalActionError
+    stats = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            board_size, player_count, actions = parse_game(line)
+            replayer = Replayer(board_size, player_count)
+            gs = replayer.game_state
+            seen = []
+            for ply, action in enumerate(actions[:plies]):
+                seen.append((gs.zobrist_key, gs.current_player, action))
+                replayer.play([action])
+            replayer.play(actions[plies:])
+        except (ValueError, IllegalActionError):
+            continue  # skip bad records
+        winner = gs.check_victory() if gs.game_over else None
+        for key, player, action in seen:
+            counts = stats.setdefault(key, {}).setdefault(action, [0, 0])
+            counts[0] += 1
+            if winner == player:
+                counts[1] += 1
+    return stats
+
+def choose_moves(stats, min_games=OPENING_BOOK_MIN_GAMES):
+    """Best-scoring action per position among those played at least min_games times"""
+    entries = []
+    for key, actions in stats.items():
+        candidates = [(wins / games, games, action) for action, (games, wins) in actions.items()
+                      if games >= min_games]
+        if not candidates:
+            continue
+        _, games, action = max(candidates, key=lambda item: (item[0], item[1]))
+        entries.append((key, action, games, actions[action][1]))
+    entries.sort(key=lambda entry: entry[0])
+    return entries
+
+def write_book(entries, filename):
+    with open(filename, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(entries)))
+        for key, action, games, wins in entries:
+            code = struct.unpack("<H", encode_action(action))[0]
+            f.write(ENTRY.pack(key, code, games, wins))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an opening book from recorded self-play games")
+    parser.add_argument("records", nargs="+", help="files of games in move notation (selfplay.py --records)")
+    parser.add_argument("--output", default=OPENING_BOOK_FILE)
+    parser.add_argument("--plies", type=int, default=OPENING_BOOK_PLIES, help="opening moves to take from each game")
+    parser.add_argument("--min-games", type=int, default=OPENING_BOOK_MIN_GAMES,
+                        help="times a move must have been played to be booked")
+    args = parser.parse_args(argv)
+
+    lines = []
+    for filename in args.records:
+        with open(filename) as f:
+            lines.extend(f.readlines())
+    entries = choose_moves(collect_stats(lines, args.plies), args.min_games)
+    write_book(entries, args.output)
+    print(f"{len(entries)} positions from {len(lines)} games written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,37 @@
 # pathfinding.py
 
+import heapq
 from collections import deque
+from instrumentation import counters
+
+def wall_edges(r, c, horizontal=True):
+    """The two cell-to-cell edges a wall slot separates"""
+    if horizontal:
+        return [((r, c), (r + 1, c)), ((r, c + 1), (r + 1, c + 1))]
+    return [((r, c), (r, c + 1)), ((r + 1, c), (r + 1, c + 1))]
 
 class Pathfinding:
     def __init__(self, game_state):
         self.game_state = game_state
+        self._distance_maps = {}
+        self._maps_version = None
+        self._dynamic_maps = {}
     
     def neighbors(self, r, c):
         """Get reachable neighbors from a position"""
-        from movement import Movement
-        mover = Movement(self.game_state)
-        
-        results = []
-        for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < self.game_state.board_size and 0 <= nc < self.game_state.board_size:
-                if not mover.is_blocked_between(r, c, nr, nc):
-                    results.append((nr, nc))
-        return results
+        return self.game_state.adjacency[r][c]
     
     def exists_path_to_goal(self, player):
         """BFS to check if player can reach their goal"""
+        counters.bfs_calls += 1
+        bitboard = self.game_state.bitboard
+        if bitboard is not None:
+            r, c = self.game_state.player_positions[player]
+            return bitboard.reachable(bitboard.cell_mask(r, c), self.goal_mask(player))
+        
         start = tuple(self.game_state.player_positions[player])
-        goal_cells = self.get_goal_cells(player)
+        goal_cells = set(self.get_goal_cells(player))
+        adjacency = self.game_state.adjacency
         visited = set()
         queue = deque([start])
         
@@ -30,7 +39,7 @@ class Pathfinding:
             r, c = queue.popleft()
             if (r, c) in goal_cells:
                 return True
-            for nr, nc in self.neighbors(r, c):
+            for nr, nc in adjacency[r][c]:
                 if (nr, nc) not in visited:
                     visited.add((nr, nc))
                     queue.append((nr, nc))
@@ -57,6 +66,20 @@ class Pathfinding:
                 return [(row, 0) for row in range(board_size)]  # Left column
         return set()
     
+    def goal_mask(self, player):
+        """Goal cells of a player as a bitboard cell mask"""
+        bitboard = self.game_state.bitboard
+        last = self.game_state.board_size - 1
+        if player == 1:
+            return bitboard.row_masks[last]  # Bottom row
+        elif player == 2:
+            return bitboard.row_masks[0]  # Top row
+        elif player == 3 and self.game_state.player_count == 4:
+            return bitboard.col_masks[last]  # Right column
+        elif player == 4 and self.game_state.player_count == 4:
+            return bitboard.col_masks[0]  # Left column
+        return 0
+    
     def paths_exist_for_all_players(self):
         """Check if all players have paths to their goals"""
         for player in range(1, self.game_state.player_count + 1):
@@ -64,19 +87,194 @@ class Pathfinding:
                 return False
         return True
     
+    def distance_map(self, player):
+        """Distance to goal from every cell, cached until the wall set changes"""
+        version = self.game_state.wall_version
+        if version != self._maps_version:
+            self._distance_maps = {}
+            self._maps_version = version
+        
+        dist = self._distance_maps.get(player)
+        if dist is None:
+            dist = self._compute_distance_map(player)
+            self._distance_maps[player] = dist
+        else:
+            counters.distance_cache_hits += 1
+        return dist
+    
+    def _compute_distance_map(self, player):
+        """Single reverse BFS seeded from all goal cells at once"""
+        counters.bfs_calls += 1
+        board_size = self.game_state.board_size
+        dist = [[float('inf')] * board_size for _ in range(board_size)]
+        
+        bitboard = self.game_state.bitboard
+        if bitboard is not None:
+            for d, layer in enumerate(bitboard.layers(self.goal_mask(player))):
+                while layer:
+                    low = layer & -layer
+                    r, c = divmod(low.bit_length() - 1, board_size)
+                    dist[r][c] = d
+                    layer ^= low
+            return dist
+        
+        adjacency = self.game_state.adjacency
+        queue = deque()
+        for r, c in self.get_goal_cells(player):
+            dist[r][c] = 0
+            queue.append((r, c))
+        
+        while queue:
+            r, c = queue.popleft()
+            d = dist[r][c] + 1
+            for nr, nc in adjacency[r][c]:
+                if dist[nr][nc] > d:
+                    dist[nr][nc] = d
+                    queue.append((nr, nc))
+        return dist
+    
     def shortest_path_length(self, player):
         """Calculate shortest path length for a player to their goal (for AI)"""
-        start = tuple(self.game_state.player_positions[player])
-        goal_cells = self.get_goal_cells(player)
-        visited = set()
-        queue = deque([(start, 0)])  # (position, distance)
+        r, c = self.game_state.player_positions[player]
+        return self.distance_map(player)[r][c]
+    
+    def dynamic_distance_map(self, player):
+        """Repairable distance map for a player, synced to the current walls"""
+        dmap = self._dynamic_maps.get(player)
+        if dmap is None:
+            dmap = DynamicDistanceMap(self, player)
+            self._dynamic_maps[player] = dmap
+        dmap.sync()
+        return dmap
+
+
+class DynamicDistanceMap:
+    """
+    Distance-to-goal map that is repaired after a single wall toggle.
+
+    Toggle the wall on the game state, then call update_wall(); only cells
+    whose distance can change are recomputed. The returned change list lets
+    restore() put the old distances back once the wall is reverted.
+    """
+    def __init__(self, pathfinding, player):
+        self.pathfinding = pathfinding
+        self.game_state = pathfinding.game_state
+        self.player = player
+        self.dist = None
+        self.version = None
+    
+    def sync(self):
+        """Full recompute if the walls changed behind this map's back"""
+        if self.version != self.game_state.wall_version:
+            self.dist = [list(row) for row in self.pathfinding.distance_map(self.player)]
+            self.version = self.game_state.wall_version
+    
+    def path_edges(self, r, c):
+        """Edges on at least one shortest path from (r, c); walls cutting none of them cannot lengthen it"""
+        dist = self.dist
+        adjacency = self.game_state.adjacency
+        edges = set()
+        if dist[r][c] == float('inf'):
+            return edges
         
+        seen = {(r, c)}
+        queue = deque([(r, c)])
         while queue:
-            (r, c), dist = queue.popleft()
-            if (r, c) in goal_cells:
-                return dist
-            for nr, nc in self.neighbors(r, c):
-                if (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    queue.append(((nr, nc), dist + 1))
-        return float('inf')  # No path found
\ No newline at end of file
+            cr, cc = queue.popleft()
+            d = dist[cr][cc] - 1
+            for nr, nc in adjacency[cr][cc]:
+                if dist[nr][nc] == d:
+                    edges.add(((cr, cc), (nr, nc)))
+                    edges.add(((nr, nc), (cr, cc)))
+                    if (nr, nc) not in seen:
+                        seen.add((nr, nc))
+                        queue.append((nr, nc))
+        return edges
+    
+    def update_wall(self, r, c, horizontal=True):
+        """Repair the map after the wall slot (r, c) was set or cleared"""
+        adjacency = self.game_state.adjacency
+        changes = []
+        removed = []
+        for a, b in wall_edges(r, c, horizontal):
+            if b in adjacency[a[0]][a[1]]:
+                self._relax_from([a, b], changes)
+            else:
+                removed.append(a)
+                removed.append(b)
+        if removed:
+            self._repair_removed(removed, changes)
+        self.version = self.game_state.wall_version
+        return changes
+    
+    def restore(self, changes):
+        """Undo update_wall() after the wall itself was reverted"""
+        dist = self.dist
+        for r, c, old in reversed(changes):
+            dist[r][c] = old
+        self.version = self.game_state.wall_version
+    
+    def _relax_from(self, cells, changes):
+        """An edge appeared: distances can only shrink, spread the improvement"""
+        dist = self.dist
+        adjacency = self.game_state.adjacency
+        queue = deque(cells)
+        while queue:
+            r, c = queue.popleft()
+            d = dist[r][c] + 1
+            for nr, nc in adjacency[r][c]:
+                if dist[nr][nc] > d:
+                    changes.append((nr, nc, dist[nr][nc]))
+                    dist[nr][nc] = d
+                    queue.append((nr, nc))
+    
+    def _repair_removed(self, cells, changes):
+        """An edge vanished: recompute only cells that lost every shortest route"""
+        dist = self.dist
+        adjacency = self.game_state.adjacency
+        INF = float('inf')
+        
+        def supported(r, c, affected):
+            d = dist[r][c] - 1
+            for nr, nc in adjacency[r][c]:
+                if dist[nr][nc] == d and (nr, nc) not in affected:
+                    return True
+            return False
+        
+        # Collect the cells whose distance is no longer justified by a neighbor
+        affected = set()
+        queue = deque()
+        for r, c in cells:
+            if (r, c) not in affected and 0 < dist[r][c] < INF and not supported(r, c, affected):
+                affected.add((r, c))
+                queue.append((r, c))
+        while queue:
+            r, c = queue.popleft()
+            d = dist[r][c] + 1
+            for nr, nc in adjacency[r][c]:
+                if (dist[nr][nc] == d and (nr, nc) not in affected and
+                        not supported(nr, nc, affected)):
+                    affected.add((nr, nc))
+                    queue.append((nr, nc))
+        if not affected:
+            return
+        
+        # Re-derive them from their unaffected border, Dijkstra-style
+        heap = []
+        for r, c in affected:
+            best = INF
+            for nr, nc in adjacency[r][c]:
+                if (nr, nc) not in affected and dist[nr][nc] + 1 < best:
+                    best = dist[nr][nc] + 1
+            changes.append((r, c, dist[r][c]))
+            dist[r][c] = best
+            if best < INF:
+                heapq.heappush(heap, (best, r, c))
+        while heap:
+            d, r, c = heapq.heappop(heap)
+            if d > dist[r][c]:
+                continue
+            for nr, nc in adjacency[r][c]:
+                if (nr, nc) in affected and dist[nr][nc] > d + 1:
+                    dist[nr][nc] = d + 1
+                    heapq.heappush(heap, (d + 1, nr, nc))
@@ -0,0 +1,124 @@
+# replay.py
+
+import argparse
+import multiprocessing
+import time
+from constants import *
+from game_state import GameState
+from movement import Movement
+from wall_placement import WallPlacement
+from pathfinding import Pathfinding
+from notation import format_action, parse_game
+
+class IllegalActionError(Exception):
+    """A game record contains an action the rules do not allow"""
+    def __init__(self, ply, action, reason):
+        super().__init__(f"ply {ply + 1} ({format_action(action)}): {reason}")
+        self.ply = ply
+        self.action = action
+        self.reason = reason
+
+
+class Replayer:
+    """Applies recorded actions to a fresh GameState, checking every one"""
+    def __init__(self, board_size, player_count, engine="lists"):
+        self.game_state = GameState(board_size, player_count, {1: None, 2: None, 3: None, 4: None},
+                                    engine=engine)
+        self.movement = Movement(self.game_state)
+        self.wall_placement = WallPlacement(self.game_state)
+        self.pathfinding = Pathfinding(self.game_state)
+
+    def illegal_reason(self, action):
+        """Why the current player may not play action, or None if it is legal"""
+        gs = self.game_state
+        if gs.game_over:
+            return "Game is already over"
+        player = gs.current_player
+        kind, data = action
+        if kind == "move":
+            if tuple(data) not in self.movement.get_legal_moves(player):
+                return "Illegal pawn move"
+            return None
+
+        if gs.walls_remaining[player] <= 0:
+            return "No walls remaining"
+        valid, reason = self.wall_placement.is_valid_wall_placement(*data)
+        if not valid:
+            return reason
+        if not self.wall_placement.keeps_paths(*data, self.pathfinding):
+            return "Blocks a player"
+        return None
+
+    def play(self, actions, record_history=False):
+        """Apply actions in order; raises IllegalActionError at the first bad one"""
+        for ply, action in enumerate(actions):
+            reason = self.illegal_reason(action)
+            if reason:
+                raise IllegalActionError(ply, action, reason)
+            self.game_state.apply_action(action, record=record_history)
+        return self.game_state
+
+
+def replay_line(line, engine="lists"):
+    """Validate one format_game line; returns a summary dict instead of raising"""
+    result = {"ok": False, "plies": 0, "winner": None, "error": None}
+    try:
+        board_size, player_count, actions = parse_game(line)
+        replayer = Replayer(board_size, player_count, engine)
+        gs = replayer.play(actions)
+    except IllegalActionError as e:
+        result["plies"] = e.ply
+        result["error"] = str(e)
+        return result
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+
+    result["ok"] = True
+    result["plies"] = len(actions)
+    if gs.game_over:
+        result["winner"] = gs.check_victory()
+    return result
+
+def _replay_numbered(item):
+    number, line, engine = item
+    return number, replay_line(line, engine)
+
+def replay_archive(lines, processes=None, engine="lists"):
+    """Validate many game lines across a process pool; yields (line number, result)"""
+    items = [(n, line, engine) for n, line in enumerate(lines, 1) if line.strip()]
+    with multiprocessing.Pool(processes) as pool:
+        for number, result in pool.imap(_replay_numbered, items, chunksize=REPLAY_CHUNK_SIZE):
+            yield number, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-validate an archive of recorded Quoridor games")
+    parser.add_argument("archive", help="text file with one game per line, e.g. '9x9/2 e2 e8 e3h ...'")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--engine", choices=BOARD_ENGINES, default="lists")
+    args = parser.parse_args(argv)
+
+    with open(args.archive) as f:
+        lines = f.readlines()
+
+    start = time.perf_counter()
+    games = invalid = plies = 0
+    winners = {}
+    for number, result in replay_archive(lines, args.processes, args.engine):
+        games += 1
+        plies += result["plies"]
+        if not result["ok"]:
+            invalid += 1
+            print(f"line {number}: {result['error']}")
+        elif result["winner"]:
+            winners[result["winner"]] = winners.get(result["winner"], 0) + 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{games} games, {invalid} invalid, {plies} actions checked in {elapsed:.2f}s "
+          f"({plies / elapsed if elapsed else 0:.0f} actions/s)")
+    for player in sorted(winners):
+        print(f"  player {player} won {winners[player]}")
+    return 1 if invalid else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
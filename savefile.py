@@ -0,0 +1,242 @@
+# savefile.py
+
+import io
+import pickle
+import struct
+from constants import *
+
+MAGIC = b"QRDG"
+FORMAT_VERSION = 2  # 2 added the start ply after the AI codes
+
+# Each action is one little-endian u16: kind in the high byte, row and
+# column packed as nibbles in the low byte (boards are at most 16x16)
+PAWN_MOVE = 0x00
+HORIZONTAL_WALL = 0x01
+VERTICAL_WALL = 0x02
+UNDONE_MARKER = 0xFE  # actions after this record were undone (redo order)
+CHECKPOINT = 0xFF     # followed by a packed position
+
+AI_CODES = {None: 0, "easy": 1, "medium": 2, "hard": 3}
+AI_NAMES = {code: name for name, code in AI_CODES.items()}
+
+class SaveFormatError(Exception):
+    """The file is not a valid save of a supported version"""
+
+
+def encode_action(action):
+    kind, data = action
+    if kind == "move":
+        tag = PAWN_MOVE
+    else:
+        tag = HORIZONTAL_WALL if data[2] else VERTICAL_WALL
+    return struct.pack("<H", (tag << 8) | (data[0] << 4) | data[1])
+
+def decode_action(code):
+    tag, row, col = code >> 8, (code >> 4) & 0xF, code & 0xF
+    if tag == PAWN_MOVE:
+        return ("move", (row, col))
+    if tag == HORIZONTAL_WALL:
+        return ("wall", (row, col, True))
+    if tag == VERTICAL_WALL:
+        return ("wall", (row, col, False))
+    raise SaveFormatError(f"Unknown action code {code:#06x}")
+
+
+def _position_size(board_size, player_count):
+    grid_bytes = ((board_size - 1) ** 2 + 7) // 8
+    return 2 + 3 * player_count + 2 * grid_bytes
+
+def encode_position(game_state):
+    """Pawns, walls left, walls, side to move and game-over flag as bytes"""
+    slots = game_state.board_size - 1
+    grid_bytes = (slots * slots + 7) // 8
+    out = bytearray([game_state.current_player, int(game_state.game_over)])
+    for player in range(1, game_state.player_count + 1):
+        row, col = game_state.player_positions[player]
+        out += bytes([row, col, game_state.walls_remaining[player]])
+    for horizontal in (True, False):
+        bits = 0
+        for r, c, h in game_state.placed_walls:
+            if h == horizontal:
+                bits |= 1 << (r * slots + c)
+        out += bits.to_bytes(grid_bytes, "little")
+    return bytes(out)
+
+def decode_position(data, board_size, player_count):
+    """Inverse of encode_position, as a plain dict"""
+    slots = board_size - 1
+    grid_bytes = (slots * slots + 7) // 8
+    position = {
+        "current_player": data[0],
+        "game_over": bool(data[1]),
+        "player_positions": {},
+        "walls_remaining": {},
+    }
+    offset = 2
+    for player in range(1, player_count + 1):
+        row, col, walls = data[offset:offset + 3]
+        position["player_positions"][player] = [row, col]
+        position["walls_remaining"][player] = walls
+        offset += 3
+    for key in ("horizontal_walls", "vertical_walls"):
+        bits = int.from_bytes(data[offset:offset + grid_bytes], "little")
+        position[key] = [[bool(bits >> (r * slots + c) & 1) for c in range(slots)] for r in range(slots)]
+        offset += grid_bytes
+    return position
+
+
+class GameWriter:
+    """
+    Streams a game to a save file: header and start position, then one
+    record per action as it is played, with a checkpoint of the full
+    position every SAVE_CHECKPOINT_INTERVAL actions.
+    """
+    def __init__(self, f, game_state, checkpoint_interval=SAVE_CHECKPOINT_INTERVAL, start_ply=0):
+        self.f = f
+        self.checkpoint_interval = checkpoint_interval
+        self.ply = 0
+        ai_codes = bytes(AI_CODES.get(game_state.ai_players.get(p)) for p in range(1, 5))
+        f.write(MAGIC + struct.pack("<BBB", FORMAT_VERSION, game_state.board_size, game_state.player_count))
+        f.write(ai_codes)
+        f.write(struct.pack("<I", start_ply))
+        f.write(encode_position(game_state))
+
+    def write_action(self, action, game_state=None):
+        """Append an action; game_state (after the action) enables checkpoints"""
+        self.f.write(encode_action(action))
+        self.ply += 1
+        if (game_state is not None and self.checkpoint_interval
+                and self.ply % self.checkpoint_interval == 0):
+            self.f.write(struct.pack("<H", CHECKPOINT << 8))
+            self.f.write(encode_position(game_state))
+
+    def write_undone(self, actions):
+        """Record undone actions, next to redo first"""
+        self.f.write(struct.pack("<H", UNDONE_MARKER << 8))
+        for action in actions:
+            self.f.write(encode_action(action))
+
+
+class GameRecord:
+    """
+    A parsed save file: configuration, start position, the action list and
+    the checkpoints. Positions are kept packed and only decoded on request.
+    """
+    def __init__(self, board_size, player_count, ai_players, start, actions, undone, checkpoints,
+                 start_ply=0):
+        self.board_size = board_size
+        self.player_count = player_count
+        self.ai_players = ai_players
+        self.start = start
+        self.actions = actions
+        self.undone = undone
+        self.checkpoints = checkpoints  # ply -> packed position
+        self.start_ply = start_ply      # game ply of the start position (earlier plies were not kept)
+
+    def position(self, packed):
+        return decode_position(packed, self.board_size, self.player_count)
+
+    def nearest_checkpoint(self, ply):
+        """(checkpoint ply, decoded position) closest at or before ply"""
+        best = 0
+        for checkpoint_ply in self.checkpoints:
+            if best < checkpoint_ply <= ply:
+                best = checkpoint_ply
+        packed = self.checkpoints[best] if best else self.start
+        return best, self.position(packed)
+
+    def deltas(self):
+        """
+        GameState history deltas for the actions, plus redo deltas for the
+        undone ones, worked out from the action list without replaying it.
+        """
+        start = self.position(self.start)
+        positions = {p: tuple(pos) for p, pos in start["player_positions"].items()}
+        player = start["current_player"]
+        game_over = start["game_over"]
+        history = []
+        for action in self.actions + self.undone:
+            origin = None
+            if action[0] == "move":
+                origin = positions[player]
+                positions[player] = action[1]
+            history.append((player, action, origin, game_over))
+            player = player % self.player_count + 1
+        done = len(self.actions)
+        return history[:done], history[done:][::-1]
+
+
+def write_game(game_state, filename):
+    """Save a game as its start position plus the action list"""
+    # Walk back to the start of the recorded history on a copy
+    replay = game_state.clone()
+    for delta in reversed(game_state.history):
+        replay.revert_action(delta)
+
+    with open(filename, "wb") as f:
+        writer = GameWriter(f, replay, start_ply=game_state.history.dropped)
+        for delta in game_state.history:
+            replay.apply_action(delta[1], record=False)
+            writer.write_action(delta[1], replay)
+        if game_state.redo_stack:
+            writer.write_undone([delta[1] for delta in reversed(game_state.redo_stack)])
+
+def read_game(filename):
+    with open(filename, "rb") as f:
+        data = f.read()
+    return parse_game(data)
+
+def parse_game(data):
+    if data[:4] != MAGIC:
+        raise SaveFormatError("Not a Quoridor save file")
+    if len(data) < 11:
+        raise SaveFormatError("Truncated save file")
+    version, board_size, player_count = struct.unpack_from("<BBB", data, 4)
+    if version not in (1, FORMAT_VERSION):
+        raise SaveFormatError(f"Unsupported save format version {version}")
+    if not MIN_BOARD_SIZE <= board_size <= MAX_BOARD_SIZE or player_count not in (2, 4):
+        raise SaveFormatError("Invalid board size or player count")
+
+    ai_players = {p: AI_NAMES.get(code) for p, code in zip(range(1, 5), data[7:11])}
+    size = _position_size(board_size, player_count)
+    offset = 11
+    start_ply = 0
+    if version >= 2:
+        if len(data) < 15:
+            raise SaveFormatError("Truncated save file")
+        start_ply = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+    start = data[offset:offset + size]
+    offset += size
+
+    actions = []
+    undone = []
+    checkpoints = {}
+    target = actions
+    codes = memoryview(data)
+    while offset < len(data):
+        if offset + 2 > len(data):
+            raise SaveFormatError("Truncated save file")
+        code = codes[offset] | (codes[offset + 1] << 8)
+        offset += 2
+        tag = code >> 8
+        if tag == CHECKPOINT:
+            checkpoints[len(actions)] = data[offset:offset + size]
+            offset += size
+        elif tag == UNDONE_MARKER:
+            target = undone
+        else:
+            target.append(decode_action(code))
+    if len(start) != size or any(len(p) != size for p in checkpoints.values()):
+        raise SaveFormatError("Truncated save file")
+    return GameRecord(board_size, player_count, ai_players, start, actions, undone, checkpoints, start_ply)
+
+
+class SafeUnpickler(pickle.Unpickler):
+    """Unpickler for old save files: plain data only, never imports or calls anything"""
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Refusing to load {module}.{name} from a save file")
+
+def load_legacy_pickle(filename):
+    with open(filename, "rb") as f:
+        return SafeUnpickler(io.BytesIO(f.read())).load()
@@ -0,0 +1,249 @@
+# search.py
+
+import time
+from constants import *
+from movement import Movement
+from wall_placement import WallPlacement
+from pathfinding import Pathfinding
+from evaluation import Evaluator
+from transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from instrumentation import counters
+
+WIN_SCORE = 100000
+INFINITY = float('inf')
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time budget for a move runs out"""
+
+
+class SearchEngine:
+    """
+    Depth-limited negamax with alpha-beta pruning and iterative deepening.
+
+    Moves are made and unmade in place with apply_action/revert_action, so
+    the board is never copied. With four players the side to move searches
+    against the coalition of all others (paranoid search): team-mates keep
+    the score, a change of team negates it.
+
+    Setting stop_event (a threading.Event) ends the search early, as if the
+    time budget had run out.
+
+    Results are cached in a transposition table keyed by the game state's
+    Zobrist key. Pass the same table on every turn to reuse them; in
+    four-player games scores depend on the searching player, so each AI
+    player needs its own table.
+    """
+    def __init__(self, game_state, max_depth=HARD_AI_MAX_DEPTH, time_limit=HARD_AI_TIME_LIMIT,
+                 wall_candidates=HARD_AI_WALL_CANDIDATES, transposition_table=None, stop_event=None):
+        self.game_state = game_state
+        self.stop_event = stop_event
+        self.table = transposition_table if transposition_table is not None else TranspositionTable()
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.wall_candidates = wall_candidates
+        self.movement = Movement(game_state)
+        self.wall_placement = WallPlacement(game_state)
+        self.pathfinding = Pathfinding(game_state)
+        self.evaluator = Evaluator(game_state, self.pathfinding)
+        self.nodes = 0
+        self.depth_reached = 0
+
+    def search(self):
+        """Best move for the current player as ("move", (r, c)) or ("wall", (r, c, h))"""
+        self.root_player = self.game_state.current_player
+        self.deadline = time.perf_counter() + self.time_limit
+        self.nodes = 0
+        self.depth_reached = 0
+        self.table.new_search()
+
+        entry = self.table.lookup(self.game_state.zobrist_key)
+        best_move = entry[3] if entry is not None else None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._search_root(depth, best_move)
+            except SearchTimeout:
+                break
+            if move is None:
+                break
+            best_move = move
+            self.table.store(self.game_state.zobrist_key, depth, score, EXACT, move)
+            self.depth_reached = depth
+            # A forced win or loss will not change with more depth
+            if abs(score) >= WIN_SCORE - self.max_depth:
+                break
+        return best_move
+
+    def _search_root(self, depth, previous_best):
+        moves = self.ordered_moves()
+        if previous_best in moves:
+            moves.remove(previous_best)
+            moves.insert(0, previous_best)
+
+        best_score = -INFINITY
+        best_move = None
+        alpha = -INFINITY
+        for move in moves:
+            score = self._child_score(move, depth, alpha, INFINITY, 1)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def _negamax(self, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes & 15 == 0 and self._out_of_time():
+            raise SearchTimeout()
+
+        key = self.game_state.zobrist_key
+        hash_move = None
+        entry = self.table.lookup(key)
+        if entry is not None:
+            entry_depth, entry_score, flag, hash_move = entry
+            if entry_depth >= depth:
+                entry_score = self._score_from_table(entry_score, ply)
+                if flag == EXACT:
+                    return entry_score
+                if flag == LOWER_BOUND:
+                    alpha = max(alpha, entry_score)
+                elif flag == UPPER_BOUND:
+                    beta = min(beta, entry_score)
+                if alpha >= beta:
+                    return entry_score
+
+        if depth == 0:
+            return self.evaluate()
+
+        moves = self.ordered_moves()
+        if not moves:
+            return self.evaluate()
+        if hash_move in moves:
+            moves.remove(hash_move)
+            moves.insert(0, hash_move)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in moves:
+            score = self._child_score(move, depth, alpha, beta, ply)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.table.store(key, depth, self._score_to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def _out_of_time(self):
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        return time.perf_counter() > self.deadline
+
+    def _score_to_table(self, score, ply):
+        """Store win scores relative to this node so they stay valid at any ply"""
+        if score >= WIN_SCORE - 1000:
+            return score + ply
+        if score <= -(WIN_SCORE - 1000):
+            return score - ply
+        return score
+
+    def _score_from_table(self, score, ply):
+        if score >= WIN_SCORE - 1000:
+            return score - ply
+        if score <= -(WIN_SCORE - 1000):
+            return score + ply
+        return score
+
+    def _child_score(self, move, depth, alpha, beta, ply):
+        """Score of move from the mover's point of view"""
+        mover = self.game_state.current_player
+        delta = self.game_state.apply_action(move, record=False)
+        try:
+            # apply_action ends the game when the mover reaches its goal
+            if self.game_state.game_over:
+                return WIN_SCORE - ply
+
+            if self._same_team(mover, self.game_state.current_player):
+                return self._negamax(depth - 1, alpha, beta, ply + 1)
+            return -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+        finally:
+            self.game_state.revert_action(delta)
+
+    def _same_team(self, a, b):
+        return a == b or (a != self.root_player and b != self.root_player)
+
+    def evaluate(self):
+        """Static score from the point of view of the side to move"""
+        score = self.evaluator.score(self.root_player)
+        return score if self.game_state.current_player == self.root_player else -score
+
+    def ordered_moves(self):
+        """Pawn moves and promising walls, most promising first"""
+        gs = self.game_state
+        player = gs.current_player
+        distances = self.pathfinding.distance_map(player)
+        pawn_moves = sorted(self.movement.get_legal_moves(player),
+                            key=lambda m: distances[m[0]][m[1]])
+        moves = [("move", m) for m in pawn_moves]
+        if gs.walls_remaining[player] > 0:
+            walls = [("wall", w) for w in self.wall_candidates_for(player)]
+            # Best pawn step first, then walls on the target's path, then the rest
+            moves = moves[:1] + walls + moves[1:]
+        return moves
+
+    def wall_candidates_for(self, player):
+        """Legal walls cutting the target's shortest paths, biggest detour first"""
+        gs = self.game_state
+        if player == self.root_player:
+            opponents = [p for p in gs.player_positions if p != player]
+            target = min(opponents, key=self.pathfinding.shortest_path_length)
+        else:
+            target = self.root_player
+
+        distances = self.pathfinding.dynamic_distance_map(target)
+        row, col = gs.player_positions[target]
+        base = distances.dist[row][col]
+        scored = []
+        for slot in self._slots_cutting(distances.path_edges(row, col)):
+            r, c, horizontal = slot
+            if not self.wall_placement.is_valid_wall_placement(r, c, horizontal)[0]:
+                continue
+            if not self.wall_placement.keeps_paths(r, c, horizontal, self.pathfinding):
+                continue
+            counters.walls_tried += 1
+            gs.set_wall(r, c, horizontal, True)
+            changes = distances.update_wall(r, c, horizontal)
+            gain = distances.dist[row][col] - base
+            gs.set_wall(r, c, horizontal, False)
+            distances.restore(changes)
+            if gain > 0:
+                scored.append((gain, slot))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [slot for _, slot in scored[:self.wall_candidates]]
+
+    def _slots_cutting(self, edges):
+        """Wall slots that would separate any of the given cell pairs"""
+        limit = self.game_state.board_size - 1
+        slots = set()
+        for (r1, c1), (r2, c2) in edges:
+            if c1 == c2:
+                r = min(r1, r2)
+                for c in (c1 - 1, c1):
+                    if 0 <= c < limit:
+                        slots.add((r, c, True))
+            else:
+                c = min(c1, c2)
+                for r in (r1 - 1, r1):
+                    if 0 <= r < limit:
+                        slots.add((r, c, False))
+        return slots
@@ -0,0 +1,198 @@
+# selfplay.py
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import time
+from constants import *
+from game_state import GameState
+from movement import Movement
+from wall_placement import WallPlacement
+from pathfinding import Pathfinding
+from ai import QuoridorAI
+from transposition import TranspositionTable
+import instrumentation
+from notation import format_game
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+def seat_difficulties(difficulties, player_count, game_index):
+    """Difficulty per player, rotated each game so nobody always moves first"""
+    seats = list(itertools.islice(itertools.cycle(difficulties), player_count))
+    shift = game_index % player_count
+    seats = seats[shift:] + seats[:shift]
+    return {p: seats[p - 1] for p in range(1, player_count + 1)}
+
+def play_game(config):
+    """Play one AI-only game without a GUI and return its result as a dict"""
+    board_size = config["board_size"]
+    player_count = config["player_count"]
+    seats = config["seats"]
+    random.seed(config["seed"])
+    instrumentation.enable(config["stats"])
+    instrumentation.recorder.clear()
+
+    ai_players = {p: seats.get(p) for p in range(1, 5)}
+    gs = GameState(board_size, player_count, ai_players, engine=config["engine"])
+    movement = Movement(gs)
+    wall_placement = WallPlacement(gs)
+    pathfinding = Pathfinding(gs)
+    # One AI per seat for the whole game, so its caches carry over between turns
+    ais = {p: QuoridorAI(gs, seats[p], time_limit=config["time_limit"],
+                         transposition_table=TranspositionTable(), use_book=config["book"])
+           for p in seats}
+    latencies = {p: [] for p in seats}
+
+    winner = None
+    plies = 0
+    actions = []
+    while plies < config["max_plies"]:
+        player = gs.current_player
+        start = time.perf_counter()
+        move = ais[player].get_move()
+        latencies[player].append(time.perf_counter() - start)
+        if move is None:
+            break
+
+        move_type, move_data = move
+        if move_type == "move":
+            if tuple(move_data) not in map(tuple, movement.get_legal_moves(player)):
+                raise ValueError(f"{seats[player]} AI chose an illegal move {move}")
+            gs.apply_action(move)
+        else:
+            success, message = wall_placement.place_wall(*move_data, pathfinding=pathfinding)
+            if not success:
+                raise ValueError(f"{seats[player]} AI chose an illegal wall {move}: {message}")
+        actions.append(move)
+        plies += 1
+
+        if gs.game_over:
+            winner = player
+            break
+
+    return {
+        "board_size": board_size,
+        "player_count": player_count,
+        "seats": seats,
+        "winner": winner,
+        "plies": plies,
+        "latencies": latencies,
+        "stats": instrumentation.recorder.records,
+        "record": format_game(board_size, player_count, actions),
+    }
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+def summarize(results):
+    """Win rates, game lengths and move latencies for one group of games"""
+    games = len(results)
+    wins = {}
+    played = {}
+    latencies = {}
+    for result in results:
+        for player, difficulty in result["seats"].items():
+            played[difficulty] = played.get(difficulty, 0) + 1
+            latencies.setdefault(difficulty, []).extend(result["latencies"][player])
+        if result["winner"] is not None:
+            difficulty = result["seats"][result["winner"]]
+            wins[difficulty] = wins.get(difficulty, 0) + 1
+
+    lengths = [result["plies"] for result in results]
+    return {
+        "games": games,
+        "draws": sum(1 for result in results if result["winner"] is None),
+        "win_rate": {d: wins.get(d, 0) / games for d in played},
+        "wins": wins,
+        "plies_mean": sum(lengths) / games,
+        "plies_min": min(lengths),
+        "plies_max": max(lengths),
+        "latency_ms": {
+            d: {f"p{q}": 1000 * percentile(values, q) for q in (50, 90, 99)}
+            for d, values in latencies.items()
+        },
+    }
+
+def print_summary(board_size, player_count, summary):
+    print(f"{board_size}x{board_size}, {player_count} players: {summary['games']} games, "
+          f"{summary['draws']} unfinished")
+    print(f"  plies: mean {summary['plies_mean']:.1f}, "
+          f"min {summary['plies_min']}, max {summary['plies_max']}")
+    for difficulty, rate in sorted(summary["win_rate"].items()):
+        lat = summary["latency_ms"][difficulty]
+        print(f"  {difficulty:<6} wins {summary['wins'].get(difficulty, 0):>4} ({100 * rate:5.1f}%)  "
+              f"move ms p50 {lat['p50']:.1f}  p90 {lat['p90']:.1f}  p99 {lat['p99']:.1f}")
+
+def build_configs(args):
+    configs = []
+    for board_size, player_count in itertools.product(args.board_sizes, args.players):
+        for game in range(args.games):
+            configs.append({
+                "board_size": board_size,
+                "player_count": player_count,
+                "seats": seat_difficulties(args.ai, player_count, game),
+                "seed": args.seed * 1000003 + len(configs),
+                "time_limit": args.time_limit,
+                "max_plies": args.max_plies,
+                "engine": args.engine,
+                "stats": args.stats is not None,
+                "book": not args.no_book,
+            })
+    return configs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI Quoridor games without the GUI")
+    parser.add_argument("--ai", nargs="+", choices=DIFFICULTIES, default=["hard", "medium"],
+                        help="difficulties seated in turn order (rotated every game)")
+    parser.add_argument("--games", type=int, default=20, help="games per board size and player count")
+    parser.add_argument("--board-sizes", type=int, nargs="+", default=[DEFAULT_BOARD_SIZE])
+    parser.add_argument("--players", type=int, nargs="+", choices=[2, 4], default=[2])
+    parser.add_argument("--time-limit", type=float, default=HARD_AI_TIME_LIMIT,
+                        help="hard AI search budget per move (seconds)")
+    parser.add_argument("--max-plies", type=int, default=SELFPLAY_MAX_PLIES,
+                        help="stop a game unfinished after this many moves")
+    parser.add_argument("--engine", choices=BOARD_ENGINES, default="lists")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stats", metavar="JSONL", help="write per-move AI statistics to this file")
+    parser.add_argument("--no-book", action="store_true", help="do not play moves from the opening book")
+    parser.add_argument("--records", metavar="FILE", help="write every game in move notation, one per line")
+    args = parser.parse_args(argv)
+
+    for board_size in args.board_sizes:
+        if not MIN_BOARD_SIZE <= board_size <= MAX_BOARD_SIZE:
+            parser.error(f"board size must be between {MIN_BOARD_SIZE} and {MAX_BOARD_SIZE}")
+
+    configs = build_configs(args)
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.processes) as pool:
+        results = pool.map(play_game, configs, chunksize=1)
+    elapsed = time.perf_counter() - start
+
+    for board_size, player_count in itertools.product(args.board_sizes, args.players):
+        group = [r for r in results if r["board_size"] == board_size and r["player_count"] == player_count]
+        print_summary(board_size, player_count, summarize(group))
+    print(f"{len(results)} games in {elapsed:.1f}s")
+
+    if args.stats:
+        with open(args.stats, "w") as f:
+            for game, result in enumerate(results):
+                for record in result["stats"]:
+                    f.write(json.dumps(dict(record, game=game)) + "\n")
+        print(f"AI move statistics written to {args.stats}")
+
+    if args.records:
+        with open(args.records, "w") as f:
+            for result in results:
+                f.write(result["record"] + "\n")
+        print(f"Game records written to {args.records}")
+
+if __name__ == "__main__":
+    main()
@@ -93,6 +93,12 @@ class StartScreen:
         )
         self.ai_mode_rb.pack(anchor="w", pady=5)
         
+        tk.Radiobutton(
+            mode_frame, text="AI vs AI (spectate)", variable=self.game_mode,
+            value="ai_ai", font=("Arial", 10), bg=START_SCREEN_BG,
+            command=self.on_mode_change
+        ).pack(anchor="w", pady=5)
+        
         self.ai_frame = tk.LabelFrame(
             scrollable_frame, 
             text="AI Settings",
@@ -156,6 +162,38 @@ class StartScreen:
         )
         note_label.pack(pady=8)
         
+        # Per-seat players for spectator games, 2 or 4 players
+        self.seats_frame = tk.LabelFrame(
+            scrollable_frame, 
+            text="Seats",
+            font=("Arial", 12, "bold"),
+            bg=START_SCREEN_BG,
+            padx=10,
+            pady=10,
+            labelanchor="nw"
+        )
+        
+        self.seat_types = {}
+        self.seat_rows = {}
+        for player in range(1, 5):
+            seat_row = tk.Frame(self.seats_frame, bg=START_SCREEN_BG)
+            tk.Label(
+                seat_row, text=f"Player {player}:", font=("Arial", 10),
+                bg=START_SCREEN_BG, width=12, anchor="w"
+            ).pack(side="left")
+            self.seat_types[player] = tk.StringVar(value="medium")
+            ttk.Combobox(
+                seat_row, textvariable=self.seat_types[player],
+                values=["human", "easy", "medium", "hard"], state="readonly",
+                width=15
+            ).pack(side="left", fill="x", expand=True, padx=(0, 10))
+            self.seat_rows[player] = seat_row
+        
+        tk.Label(
+            self.seats_frame, text="Set the pace with the AI delay slider in the game",
+            font=("Arial", 9), bg=START_SCREEN_BG, fg="blue"
+        ).pack(side="bottom", pady=8)
+        
         # Board Size Frame with Slider
         self.size_frame = tk.LabelFrame(
             scrollable_frame, 
@@ -230,6 +268,7 @@ class StartScreen:
 
         # Initialize UI state
         self.ai_frame.pack_forget()
+        self.seats_frame.pack_forget()
         self.on_player_count_change()
         self.on_mode_change()
         
@@ -243,29 +282,42 @@ class StartScreen:
     def on_player_count_change(self):
         player_count = self.player_count.get()
         
+        for player, seat_row in self.seat_rows.items():
+            if player <= player_count:
+                seat_row.pack(fill="x", pady=2)
+            else:
+                seat_row.pack_forget()
+        
         if player_count == 4:
-            self.game_mode.set("human_human")
+            if self.game_mode.get() == "human_ai":
+                self.game_mode.set("human_human")
             self.ai_mode_rb.config(state="disabled")
-            self.ai_frame.pack_forget()
         else:
             self.ai_mode_rb.config(state="normal")
-            self.on_mode_change()
+        self.on_mode_change()
     
     def on_mode_change(self):
         mode = self.game_mode.get()
         
-        if mode == "human_human":
-            self.ai_frame.pack_forget()
-        else:
+        self.ai_frame.pack_forget()
+        self.seats_frame.pack_forget()
+        if mode == "human_ai":
             # Pack AI frame before size frame
             self.ai_frame.pack(fill="x", pady=10, before=self.size_frame)
+        elif mode == "ai_ai":
+            self.seats_frame.pack(fill="x", pady=10, before=self.size_frame)
     
     def start_game(self):
         mode = self.game_mode.get()
         board_size = self.board_size.get()
         player_count = self.player_count.get()
         
-        if mode == "human_human" or player_count == 4:
+        if mode == "ai_ai":
+            ai_settings = {1: None, 2: None, 3: None, 4: None}
+            for player in range(1, player_count + 1):
+                seat = self.seat_types[player].get()
+                ai_settings[player] = None if seat == "human" else seat
+        elif mode == "human_human" or player_count == 4:
             ai_settings = {1: None, 2: None, 3: None, 4: None}
         else:
             ai_settings = {1: None, 2: self.ai_difficulty.get(), 3: None, 4: None}
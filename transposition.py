@@ -0,0 +1,49 @@
+# transposition.py
+
+from constants import *
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+class TranspositionTable:
+    """
+    Bounded table of search results keyed by Zobrist key.
+
+    One entry per slot (key & mask). A new result replaces the old one when
+    the slot is empty, holds the same position, was written by an earlier
+    search, or was searched no deeper than the new result.
+    """
+    def __init__(self, size=TRANSPOSITION_TABLE_SIZE):
+        # Round up to a power of two so slots are a simple mask
+        slots = 1
+        while slots < size:
+            slots <<= 1
+        self.mask = slots - 1
+        self.entries = [None] * slots
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        """Age existing entries so the next search may overwrite them"""
+        self.generation += 1
+
+    def lookup(self, key):
+        """(depth, score, flag, best_move) for the position, or None"""
+        self.probes += 1
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+        return None
+
+    def store(self, key, depth, score, flag, best_move):
+        index = key & self.mask
+        old = self.entries[index]
+        if (old is None or old[0] == key or old[5] != self.generation or depth >= old[1]):
+            self.entries[index] = (key, depth, score, flag, best_move, self.generation)
+
+    def clear(self):
+        self.entries = [None] * len(self.entries)
+        self.generation = 0
@@ -1,6 +1,18 @@
+from connectivity import ConnectivityOracle
+
 class WallPlacement:
     def __init__(self, game_state):
         self.game_state = game_state
+        self.connectivity = ConnectivityOracle(game_state)
+
+        # Legal-slot cache, kept in step with the wall set by diffing
+        self._open_slots = None
+        self._slots_walls = None
+        self._safe_slots = None
+        self._loop_slots = None
+        self._slots_generation = 0
+        self._legal_key = None
+        self._legal = None
 
     def is_valid_wall_placement(self, r, c, horizontal=True):
         N = self.game_state.board_size
@@ -45,29 +57,88 @@ class WallPlacement:
 
         return True, ""
 
+    def keeps_paths(self, r, c, horizontal, pathfinding):
+        """Check a wall leaves every player a path, searching only if it closes a loop"""
+        return self.connectivity.keeps_paths(r, c, horizontal, pathfinding)
+
     def place_wall(self, r, c, horizontal=True, pathfinding=None):
         valid, reason = self.is_valid_wall_placement(r, c, horizontal)
         if not valid:
             return False, reason
 
-        H = self.game_state.horizontal_walls
-        V = self.game_state.vertical_walls
-
-        # temporary placement
-        if horizontal:
-            H[r][c] = True
-        else:
-            V[r][c] = True
-
         # verify all players still have a path
-        if pathfinding and not pathfinding.paths_exist_for_all_players():
-            if horizontal:
-                H[r][c] = False
-            else:
-                V[r][c] = False
+        if pathfinding and not self.keeps_paths(r, c, horizontal, pathfinding):
             return False, "Blocks a player"
 
-        # consume a wall
-        self.game_state.walls_remaining[self.game_state.current_player] -= 1
+        # place it, consume a wall and pass the turn (recorded for undo)
+        self.game_state.apply_action(("wall", (r, c, horizontal)))
 
         return True, "Wall placed"
+
+    def legal_walls(self, pathfinding=None):
+        """
+        Set of (r, c, horizontal) slots where a wall may be placed right now.
+
+        Geometric legality is cached and only the neighbourhood of walls
+        added or removed since the last call is re-validated. Slots that
+        cannot close a loop are always path-safe; only the loop-closing ones
+        are searched again, and only when walls or pawns moved.
+        """
+        self._update_open_slots()
+        if pathfinding is None:
+            return set(self._open_slots)
+
+        key = (self._slots_generation,
+               tuple(tuple(pos) for pos in self.game_state.player_positions.values()))
+        if key != self._legal_key:
+            if self._safe_slots is None:
+                self._classify_slots()
+            legal = set(self._safe_slots)
+            for r, c, horizontal in self._loop_slots:
+                if self.connectivity.keeps_paths(r, c, horizontal, pathfinding):
+                    legal.add((r, c, horizontal))
+            self._legal = legal
+            self._legal_key = key
+        return set(self._legal)
+
+    def _update_open_slots(self):
+        walls = self.game_state.placed_walls
+        if self._open_slots is None or len(self.game_state.horizontal_walls) != self._slots_size:
+            self._slots_size = len(self.game_state.horizontal_walls)
+            self._open_slots = set()
+            for r in range(self._slots_size):
+                for c in range(self._slots_size):
+                    for horizontal in [True, False]:
+                        if self.is_valid_wall_placement(r, c, horizontal)[0]:
+                            self._open_slots.add((r, c, horizontal))
+            self._slots_walls = set(walls)
+            self._safe_slots = None
+            self._slots_generation += 1
+            return
+
+        changed = walls ^ self._slots_walls
+        if not changed:
+            return
+
+        # Strike out / restore only the overlapping, adjacent and crossing slots
+        for r, c, _ in changed:
+            for nr in range(max(r - 1, 0), min(r + 2, self._slots_size)):
+                for nc in range(max(c - 1, 0), min(c + 2, self._slots_size)):
+                    for horizontal in [True, False]:
+                        if self.is_valid_wall_placement(nr, nc, horizontal)[0]:
+                            self._open_slots.add((nr, nc, horizontal))
+                        else:
+                            self._open_slots.discard((nr, nc, horizontal))
+        self._slots_walls = set(walls)
+        self._safe_slots = None
+        self._slots_generation += 1
+
+    def _classify_slots(self):
+        """Split open slots into always-safe ones and loop-closing ones"""
+        self._safe_slots = set()
+        self._loop_slots = []
+        for slot in self._open_slots:
+            if self.connectivity.closes_loop(*slot):
+                self._loop_slots.append(slot)
+            else:
+                self._safe_slots.add(slot)
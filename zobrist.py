@@ -0,0 +1,43 @@
+# zobrist.py
+
+import random
+from constants import *
+
+class ZobristKeys:
+    """
+    Random 64-bit keys for pawn squares, wall slots, walls-remaining counts
+    and side to move. Seeded per board size, so keys are identical across
+    runs and processes.
+    """
+    def __init__(self, board_size):
+        rng = random.Random(ZOBRIST_SEED * 100 + board_size)
+        cells = board_size * board_size
+        slots = (board_size - 1) * (board_size - 1)
+
+        def key():
+            return rng.getrandbits(64)
+
+        self.board_size = board_size
+        self.pawn = {p: [key() for _ in range(cells)] for p in range(1, 5)}
+        self.horizontal = [key() for _ in range(slots)]
+        self.vertical = [key() for _ in range(slots)]
+        self.walls_left = {p: [key() for _ in range(MAX_WALLS_PER_PLAYER + 1)] for p in range(1, 5)}
+        self.side = {p: key() for p in range(1, 5)}
+
+    def pawn_key(self, player, row, col):
+        return self.pawn[player][row * self.board_size + col]
+
+    def wall_key(self, row, col, horizontal=True):
+        keys = self.horizontal if horizontal else self.vertical
+        return keys[row * (self.board_size - 1) + col]
+
+
+_keys_by_size = {}
+
+def zobrist_keys(board_size):
+    """Shared key set for a board size"""
+    keys = _keys_by_size.get(board_size)
+    if keys is None:
+        keys = ZobristKeys(board_size)
+        _keys_by_size[board_size] = keys
+    return keys